@@ -0,0 +1,303 @@
+"""
+Module: attempt_store.py
+Purpose: Persist graded quiz attempts in SQLite and query them across a cohort
+"""
+
+import argparse
+import sqlite3
+import time
+
+
+DEFAULT_DB_PATH = "quiz_attempts.db"
+DEFAULT_BATCH_SIZE = 1000
+
+# Bump when the schema changes; stores with another version are rejected
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    cohort TEXT NOT NULL,
+    student TEXT NOT NULL,
+    question TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    chosen TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    latency REAL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_student ON attempts (student, keyword, correct);
+CREATE INDEX IF NOT EXISTS attempts_keyword ON attempts (keyword, cohort);
+
+-- Running totals per keyword, kept up to date on every insert so cohort
+-- queries read one small row per keyword instead of every attempt
+CREATE TABLE IF NOT EXISTS keyword_stats (
+    cohort TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    wrong INTEGER NOT NULL,
+    PRIMARY KEY (cohort, keyword)
+) WITHOUT ROWID;
+"""
+
+
+class AttemptStore:
+    """
+    Append-only store of quiz attempts.
+
+    Attempts are buffered in memory and written in batches, each batch in
+    one transaction together with the per-keyword totals. Use the store as
+    a context manager (or call close()) so the last batch is written.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Open (or create) an attempt store.
+
+        Args:
+            path (str): SQLite database file (":memory:" for a throwaway store)
+            batch_size (int): Buffered attempts that trigger a write
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            with self._conn:
+                self._conn.executescript(SCHEMA)
+                self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        elif version != SCHEMA_VERSION:
+            self._conn.close()
+            raise ValueError(f"Attempt store '{path}' has schema version "
+                             f"{version}, expected {SCHEMA_VERSION}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_attempt(self, student, question, keyword, chosen, correct,
+                    latency=None, cohort=""):
+        """
+        Record one answered question.
+
+        Args:
+            student (str): Student identifier
+            question (str): Question text
+            keyword (str): Keyword the question tests
+            chosen (str): Option the student chose ("" if unanswered)
+            correct (bool): Whether the answer was correct
+            latency (float): Seconds taken to answer (optional)
+            cohort (str): Class or group the student belongs to
+        """
+        self._pending.append((cohort, student, question, keyword, chosen,
+                              int(bool(correct)), latency, time.time()))
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def add_results(self, student, results, latencies=None, cohort=""):
+        """
+        Record every answer of a graded quiz.
+
+        Args:
+            student (str): Student identifier
+            results (dict): Results from grader.grade_quiz()
+            latencies (dict): Seconds per question number (optional)
+            cohort (str): Class or group the student belongs to
+        """
+        if latencies is None:
+            latencies = {}
+
+        for detail in results['details']:
+            self.add_attempt(student, detail['question'], detail.get('keyword', ''),
+                             detail['user_answer'], detail['is_correct'],
+                             latencies.get(detail['question_num']), cohort)
+
+    def flush(self):
+        """
+        Write the buffered attempts in one transaction.
+        """
+        if not self._pending:
+            return
+
+        # Fold the batch into per-keyword totals before touching the table
+        totals = {}
+        for row in self._pending:
+            key = (row[0], row[3])
+            counts = totals.setdefault(key, [0, 0])
+            counts[0] += 1
+            counts[1] += 1 - row[5]
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO attempts (cohort, student, question, keyword, chosen,"
+                " correct, latency, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._pending)
+            self._conn.executemany(
+                "INSERT INTO keyword_stats (cohort, keyword, attempts, wrong)"
+                " VALUES (?, ?, ?, ?) ON CONFLICT (cohort, keyword) DO UPDATE SET"
+                " attempts = attempts + excluded.attempts,"
+                " wrong = wrong + excluded.wrong",
+                [(cohort, keyword, counts[0], counts[1])
+                 for (cohort, keyword), counts in totals.items()])
+
+        self._pending = []
+
+    def close(self):
+        """
+        Write any buffered attempts and close the database.
+        """
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+
+    def weakest_keywords(self, cohort=None, limit=10, min_attempts=1):
+        """
+        Get the keywords answered wrong most often.
+
+        Reads the running per-keyword totals, so the cost depends on the
+        number of keywords, not on the number of stored attempts.
+
+        Args:
+            cohort (str): Cohort to look at (None for all cohorts)
+            limit (int): Maximum number of keywords
+            min_attempts (int): Ignore keywords with fewer attempts
+
+        Returns:
+            list: Dicts with keyword, attempts, wrong and error_rate,
+                highest error rate first
+        """
+        self.flush()
+
+        if cohort is None:
+            rows = self._conn.execute(
+                "SELECT keyword, SUM(attempts) AS n, SUM(wrong) AS w FROM keyword_stats"
+                " GROUP BY keyword HAVING n >= ?"
+                " ORDER BY CAST(w AS REAL) / n DESC, n DESC, keyword LIMIT ?",
+                (min_attempts, limit))
+        else:
+            rows = self._conn.execute(
+                "SELECT keyword, attempts, wrong FROM keyword_stats"
+                " WHERE cohort = ? AND attempts >= ?"
+                " ORDER BY CAST(wrong AS REAL) / attempts DESC, attempts DESC, keyword"
+                " LIMIT ?",
+                (cohort, min_attempts, limit))
+
+        return [_keyword_row(keyword, attempts, wrong)
+                for keyword, attempts, wrong in rows]
+
+    def student_weak_keywords(self, student, limit=10):
+        """
+        Get the keywords one student answered wrong most often.
+
+        Args:
+            student (str): Student identifier
+            limit (int): Maximum number of keywords
+
+        Returns:
+            list: Dicts with keyword, attempts, wrong and error_rate
+        """
+        self.flush()
+
+        rows = self._conn.execute(
+            "SELECT keyword, COUNT(*) AS n, SUM(1 - correct) AS w FROM attempts"
+            " WHERE student = ? GROUP BY keyword HAVING w > 0"
+            " ORDER BY CAST(w AS REAL) / n DESC, n DESC, keyword LIMIT ?",
+            (student, limit))
+
+        return [_keyword_row(keyword, attempts, wrong)
+                for keyword, attempts, wrong in rows]
+
+    def student_history(self, student, limit=100):
+        """
+        Get a student's most recent attempts.
+
+        Args:
+            student (str): Student identifier
+            limit (int): Maximum number of attempts
+
+        Returns:
+            list: Attempt dicts, newest first
+        """
+        self.flush()
+
+        rows = self._conn.execute(
+            "SELECT cohort, question, keyword, chosen, correct, latency, created"
+            " FROM attempts WHERE student = ? ORDER BY id DESC LIMIT ?",
+            (student, limit))
+
+        return [{
+            "cohort": cohort,
+            "question": question,
+            "keyword": keyword,
+            "chosen": chosen,
+            "is_correct": bool(correct),
+            "latency": latency,
+            "created": created
+        } for cohort, question, keyword, chosen, correct, latency, created in rows]
+
+    def count(self):
+        """
+        Get the number of stored attempts.
+
+        Returns:
+            int: Number of attempts, including buffered ones
+        """
+        stored = self._conn.execute("SELECT COUNT(*) FROM attempts").fetchone()[0]
+        return stored + len(self._pending)
+
+
+def _keyword_row(keyword, attempts, wrong):
+    """
+    Build one result row of a weak-keyword query.
+    """
+    return {
+        "keyword": keyword,
+        "attempts": attempts,
+        "wrong": wrong,
+        "error_rate": round(wrong / attempts * 100, 2) if attempts else 0.0
+    }
+
+
+def main():
+    """
+    Command-line entry point for attempt queries.
+    """
+    parser = argparse.ArgumentParser(description="Query stored quiz attempts.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH,
+                        help=f"Attempt database (default: {DEFAULT_DB_PATH})")
+    parser.add_argument("--cohort", default=None,
+                        help="Only look at this cohort (default: all)")
+    parser.add_argument("--student", default=None,
+                        help="Show one student's weak keywords instead")
+    parser.add_argument("-n", "--limit", type=int, default=10,
+                        help="Number of keywords to show (default: 10)")
+    args = parser.parse_args()
+
+    with AttemptStore(args.db) as store:
+        if args.student:
+            rows = store.student_weak_keywords(args.student, args.limit)
+            title = f"Weakest keywords for {args.student}"
+        else:
+            rows = store.weakest_keywords(args.cohort, args.limit)
+            title = f"Weakest keywords ({args.cohort or 'all cohorts'})"
+
+        print(f"{title} - {store.count()} attempts stored")
+        print("-" * 60)
+        for row in rows:
+            print(f"{row['keyword']:<30}{row['wrong']:>8}/{row['attempts']:<8}"
+                  f"{row['error_rate']:>8.2f}%")
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Module: bank_format.py
+Purpose: Compact binary question-bank files with memory-mapped random access
+
+File layout (little-endian):
+    header          magic, version, question count, string count, table offsets
+    string offsets  (strings + 1) x uint64, start of each string in the blob
+    string blob     UTF-8 text of every distinct string, stored once
+    record offsets  (questions + 1) x uint64, start of each question record
+    records         question id, keyword id, section id, option count,
+                    answer index, then one uint32 string id per option
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+
+import mcq
+from mcq import MCQ
+
+
+MAGIC = b"QBNK"
+
+# Bump when the layout changes; files with another version are rejected
+FORMAT_VERSION = 2
+
+BANK_EXTENSION = ".qbank"
+
+_HEADER = struct.Struct("<4sHHIIQQQQ")
+_OFFSET = struct.Struct("<Q")
+_RECORD = struct.Struct("<IIIBB")
+
+
+def write_bank(mcqs, path):
+    """
+    Write a question bank in the binary format.
+
+    Every distinct string (question, option, keyword or section) is stored
+    once in the string table; questions refer to strings by id, so options
+    shared by many questions cost four bytes each.
+
+    Args:
+        mcqs (list): List of MCQ objects or MCQ dictionaries
+        path (str): Output file path
+    """
+    string_ids = {}
+    strings = []
+
+    def intern(text):
+        string_id = string_ids.get(text)
+        if string_id is None:
+            string_id = string_ids[text] = len(strings)
+            strings.append(text.encode('utf-8'))
+        return string_id
+
+    records = []
+    for question in mcq.from_dicts(mcqs):
+        option_ids = [intern(option) for option in question.options]
+        records.append(_RECORD.pack(intern(question.question), intern(question.keyword),
+                                    intern(question.section), len(option_ids),
+                                    question.answer_index)
+                       + struct.pack(f"<{len(option_ids)}I", *option_ids))
+
+    string_offsets_at = _HEADER.size
+    blob_at = string_offsets_at + (len(strings) + 1) * _OFFSET.size
+    blob_size = sum(len(s) for s in strings)
+    record_offsets_at = blob_at + blob_size
+    records_at = record_offsets_at + (len(records) + 1) * _OFFSET.size
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(records), len(strings),
+                                string_offsets_at, blob_at, record_offsets_at, records_at))
+        file.write(_pack_offsets(strings))
+        file.writelines(strings)
+        file.write(_pack_offsets(records))
+        file.writelines(records)
+
+    os.replace(tmp_path, path)
+
+
+class BankFile:
+    """
+    Read-only view of a binary question bank backed by mmap.
+
+    Opening a bank only reads the header; question N is decoded on access
+    from the offset tables, so even very large banks open instantly and
+    only the pages that are actually read are loaded.
+    """
+
+    def __init__(self, path):
+        """
+        Open a binary question bank.
+
+        Args:
+            path (str): Bank file path
+
+        Raises:
+            ValueError: If the file is not a bank of the current version
+        """
+        self.path = path
+
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"'{path}' is not a question bank file")
+
+        (magic, version, _, self._num_questions, self._num_strings,
+         self._string_offsets_at, self._blob_at, self._record_offsets_at,
+         self._records_at) = _HEADER.unpack_from(self._map, 0)
+
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a question bank file")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"'{path}' has bank format version {version}, "
+                             f"expected {FORMAT_VERSION}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self._num_questions
+
+    def __getitem__(self, n):
+        """
+        Decode question n (0-based, negative counts from the end).
+        """
+        if n < 0:
+            n += self._num_questions
+        if not 0 <= n < self._num_questions:
+            raise IndexError("question index out of range")
+
+        at = self._records_at + _OFFSET.unpack_from(
+            self._map, self._record_offsets_at + n * _OFFSET.size)[0]
+        (question_id, keyword_id, section_id,
+         num_options, answer_index) = _RECORD.unpack_from(self._map, at)
+        option_ids = struct.unpack_from(f"<{num_options}I", self._map, at + _RECORD.size)
+
+        return MCQ(self.string(question_id), [self.string(i) for i in option_ids],
+                   answer_index, self.string(keyword_id), self.string(section_id))
+
+    def __iter__(self):
+        for n in range(self._num_questions):
+            yield self[n]
+
+    def string(self, string_id):
+        """
+        Decode one entry of the string table.
+
+        Args:
+            string_id (int): String id
+
+        Returns:
+            str: Decoded text
+        """
+        start, end = struct.unpack_from("<2Q", self._map,
+                                        self._string_offsets_at + string_id * _OFFSET.size)
+        return self._map[self._blob_at + start:self._blob_at + end].decode('utf-8')
+
+    def close(self):
+        """
+        Release the memory map.
+        """
+        self._map.close()
+
+
+def open_bank(path):
+    """
+    Open a binary question bank for random access.
+
+    Args:
+        path (str): Bank file path
+
+    Returns:
+        BankFile: Memory-mapped bank
+    """
+    return BankFile(path)
+
+
+def read_bank(path):
+    """
+    Read every question of a binary question bank.
+
+    Args:
+        path (str): Bank file path
+
+    Returns:
+        list: List of MCQ objects
+    """
+    with BankFile(path) as bank:
+        return list(bank)
+
+
+def export_json(bank_path, json_path):
+    """
+    Convert a binary question bank into a JSON bank.
+
+    Args:
+        bank_path (str): Binary bank file
+        json_path (str): Output JSON file
+    """
+    with open(json_path, 'w', encoding='utf-8') as file:
+        json.dump(mcq.to_dicts(read_bank(bank_path)), file, indent=2)
+
+
+def import_json(json_path, bank_path):
+    """
+    Convert a JSON bank into a binary question bank.
+
+    Args:
+        json_path (str): JSON bank file (list of MCQ dictionaries)
+        bank_path (str): Output binary bank file
+
+    Returns:
+        int: Number of questions written
+    """
+    with open(json_path, 'r', encoding='utf-8') as file:
+        mcqs = mcq.from_dicts(json.load(file))
+
+    write_bank(mcqs, bank_path)
+    return len(mcqs)
+
+
+def _pack_offsets(items):
+    """
+    Pack the cumulative start offsets of byte strings, plus the end offset.
+    """
+    offsets = [0] * (len(items) + 1)
+    position = 0
+    for i, item in enumerate(items):
+        offsets[i] = position
+        position += len(item)
+    offsets[-1] = position
+
+    return struct.pack(f"<{len(offsets)}Q", *offsets)
+
+
+def main():
+    """
+    Command-line entry point to convert between JSON and binary banks.
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert question banks between JSON and the binary format.")
+    parser.add_argument("source", help="Input bank (.json or .qbank)")
+    parser.add_argument("target", help="Output bank (.json or .qbank)")
+    args = parser.parse_args()
+
+    try:
+        if args.source.endswith(BANK_EXTENSION):
+            export_json(args.source, args.target)
+            print(f"✓ Exported {args.source} to {args.target}")
+        else:
+            count = import_json(args.source, args.target)
+            print(f"✓ Wrote {count} questions to {args.target}")
+    except (OSError, ValueError) as e:
+        print(f"Error converting bank: {e}")
+        sys.exit(1)
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Module: batch.py
+Purpose: Generate question banks for many lecture files using a process pool
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bank_format
+import cache
+import dedup
+import ingest
+import keyword_scoring
+import mcq
+import qa_generator
+
+
+# DF indexes already loaded by this worker process, keyed by path
+_DF_INDEXES = {}
+
+# Bank file extension per output format
+BANK_FORMATS = {"json": ".json", "binary": bank_format.BANK_EXTENSION}
+
+
+def find_notes_files(source, pattern=None):
+    """
+    Find lecture notes files from a directory or a glob pattern.
+
+    Args:
+        source (str): Directory path or glob pattern
+        pattern (str): File pattern used when source is a directory
+            (default: every extension ingest can parse)
+
+    Returns:
+        list: Sorted list of file paths
+    """
+    if not os.path.isdir(source):
+        return sorted(path for path in glob.glob(source) if os.path.isfile(path))
+
+    if pattern is not None:
+        paths = glob.glob(os.path.join(source, pattern))
+    else:
+        paths = [os.path.join(source, name) for name in os.listdir(source)
+                 if os.path.splitext(name)[1].lower() in ingest.EXTENSIONS]
+
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def bank_path_for(notes_path, output_dir, bank_format_name="json"):
+    """
+    Build the output path of the question bank for a notes file.
+
+    Args:
+        notes_path (str): Path to the lecture notes file
+        output_dir (str): Directory where banks are written
+        bank_format_name (str): "json" or "binary"
+
+    Returns:
+        str: Path of the question bank
+    """
+    # Plain-text notes keep their historical bank names; other formats
+    # keep their extension so "intro.md" and "intro.txt" do not collide
+    name, extension = os.path.splitext(os.path.basename(notes_path))
+    if extension.lower() != ".txt":
+        name += extension
+    return os.path.join(output_dir, name + BANK_FORMATS[bank_format_name])
+
+
+def generate_bank(notes_path, output_dir, num_questions, seed=None, cache_dir=None,
+                  df_index_path=None, bank_format_name="json", dedupe=False):
+    """
+    Generate and write the question bank for a single notes file.
+
+    Args:
+        notes_path (str): Path to the lecture notes file
+        output_dir (str): Directory where banks are written
+        num_questions (int): Number of questions per bank
+        seed (int): Seed for reproducible banks (optional)
+        cache_dir (str): Question-bank cache directory (optional)
+        df_index_path (str): DF index for TF-IDF keywords (optional)
+        bank_format_name (str): "json" or "binary" (see bank_format.py)
+        dedupe (bool): Drop near-duplicate questions before writing
+
+    Returns:
+        dict: Per-file statistics (path, bank, questions, duplicates,
+            seconds, error)
+    """
+    start = time.perf_counter()
+    stats = {
+        "path": notes_path,
+        "bank": "",
+        "questions": 0,
+        "duplicates": 0,
+        "seconds": 0.0,
+        "error": ""
+    }
+
+    try:
+        document = ingest.parse_document(notes_path)
+    except ingest.IngestError as e:
+        stats["error"] = e.message
+        stats["seconds"] = time.perf_counter() - start
+        return stats
+
+    df_index = _get_df_index(df_index_path) if df_index_path else None
+
+    notes = document['text']
+    if notes:
+        if cache_dir:
+            mcqs = cache.get_or_generate(notes, num_questions, seed, cache_dir=cache_dir,
+                                         df_index=df_index, sections=document['sections'])
+        else:
+            mcqs = qa_generator.generate_mcqs(notes, num_questions, seed, df_index=df_index,
+                                              sections=document['sections'])
+
+        if dedupe:
+            mcqs, stats["duplicates"] = dedup.dedupe_mcqs(mcqs)
+
+        bank_path = bank_path_for(notes_path, output_dir, bank_format_name)
+        if bank_format_name == "binary":
+            bank_format.write_bank(mcqs, bank_path)
+        else:
+            with open(bank_path, 'w', encoding='utf-8') as file:
+                json.dump(mcq.to_dicts(mcqs), file, indent=2)
+
+        stats["bank"] = bank_path
+        stats["questions"] = len(mcqs)
+    else:
+        stats["error"] = "No text loaded"
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def generate_banks(paths, output_dir, num_questions=5, workers=None, seed=None,
+                   cache_dir=None, df_index_path=None, bank_format_name="json",
+                   dedupe=False):
+    """
+    Generate question banks for many notes files in parallel.
+
+    Args:
+        paths (list): List of lecture notes file paths
+        output_dir (str): Directory where banks are written
+        num_questions (int): Number of questions per bank
+        workers (int): Number of worker processes (default: CPU count)
+        seed (int): Seed for reproducible banks (optional)
+        cache_dir (str): Question-bank cache directory (optional)
+        df_index_path (str): DF index for TF-IDF keywords (optional)
+        bank_format_name (str): "json" or "binary" (see bank_format.py)
+        dedupe (bool): Drop near-duplicate questions before writing
+
+    Returns:
+        dict: Summary with per-file statistics and overall throughput
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(generate_bank, path, output_dir, num_questions, seed,
+                            cache_dir, df_index_path, bank_format_name, dedupe)
+            for path in paths
+        ]
+        files = [future.result() for future in futures]
+
+    elapsed = time.perf_counter() - start
+    total_questions = sum(stats["questions"] for stats in files)
+
+    summary = {
+        "files": files,
+        "total_files": len(files),
+        "failed_files": sum(1 for stats in files if stats["error"]),
+        "total_questions": total_questions,
+        "total_duplicates": sum(stats["duplicates"] for stats in files),
+        "seconds": elapsed,
+        "files_per_sec": len(files) / elapsed if elapsed > 0 else 0.0,
+        "questions_per_sec": total_questions / elapsed if elapsed > 0 else 0.0
+    }
+
+    return summary
+
+
+def prepare_df_index(paths, df_index_path):
+    """
+    Make sure a DF index for the corpus exists on disk.
+
+    An existing index file is reused as is; otherwise one is built over
+    all the given notes files and saved, once, before the workers start.
+
+    Args:
+        paths (list): List of lecture notes file paths
+        df_index_path (str): Path of the DF index file
+    """
+    if os.path.exists(df_index_path):
+        return
+
+    print(f"Building DF index over {len(paths)} files...")
+    # Files are parsed on a thread pool; unreadable files are left out
+    df_index = keyword_scoring.build_df_index(
+        result["text"] for result in ingest.ingest_files(paths) if not result["error"])
+    keyword_scoring.save_df_index(df_index, df_index_path)
+
+
+def _get_df_index(path):
+    """
+    Load a DF index once per worker process.
+    """
+    if path not in _DF_INDEXES:
+        _DF_INDEXES[path] = keyword_scoring.load_df_index(path)
+    return _DF_INDEXES[path]
+
+
+def print_summary(summary):
+    """
+    Print per-file timing and overall throughput.
+
+    Args:
+        summary (dict): Summary from generate_banks()
+    """
+    print("\n" + "="*60)
+    print("BATCH GENERATION SUMMARY".center(60))
+    print("="*60 + "\n")
+
+    for stats in summary['files']:
+        if stats['error']:
+            print(f"✗ {stats['path']}: {stats['error']} ({stats['seconds']:.3f}s)")
+        else:
+            print(f"✓ {stats['path']}: {stats['questions']} questions "
+                  f"({stats['seconds']:.3f}s)")
+
+    print("\n" + "-"*60)
+    print(f"Files:              {summary['total_files']} "
+          f"({summary['failed_files']} failed)")
+    print(f"Questions:          {summary['total_questions']}")
+    if summary['total_duplicates']:
+        print(f"Duplicates removed: {summary['total_duplicates']}")
+    print(f"Total time:         {summary['seconds']:.3f}s")
+    print(f"Throughput:         {summary['files_per_sec']:.2f} files/sec, "
+          f"{summary['questions_per_sec']:.2f} questions/sec")
+    print("="*60 + "\n")
+
+
+def main():
+    """
+    Command-line entry point for batch generation.
+    """
+    parser = argparse.ArgumentParser(
+        description="Generate one question bank per lecture notes file.")
+    parser.add_argument("source", help="Directory or glob of notes files")
+    parser.add_argument("-o", "--output", default="banks",
+                        help="Output directory for banks (default: banks)")
+    parser.add_argument("-n", "--num-questions", type=int, default=5,
+                        help="Questions per bank (default: 5)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for reproducible banks")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Reuse banks of unchanged files from this cache")
+    parser.add_argument("--df-index", default=None,
+                        help="Pick keywords by TF-IDF using this DF index file "
+                             "(built over the input files if missing)")
+    parser.add_argument("--format", choices=sorted(BANK_FORMATS), default="json",
+                        help="Bank file format (default: json)")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Remove near-duplicate questions from each bank")
+    args = parser.parse_args()
+
+    paths = find_notes_files(args.source)
+
+    if not paths:
+        print(f"Error: No notes files found for '{args.source}'!")
+        return
+
+    if args.df_index:
+        prepare_df_index(paths, args.df_index)
+
+    summary = generate_banks(paths, args.output, args.num_questions, args.workers,
+                             args.seed, args.cache_dir, args.df_index, args.format,
+                             args.dedup)
+    print_summary(summary)
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Module: benchmark.py
+Purpose: Benchmark the generate -> grade -> report pipeline on synthetic corpora
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import grader
+import qa_generator
+import report
+
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Vocabulary for synthetic lecture notes
+SUBJECTS = [
+    "Python", "Variables", "Lists", "Dictionaries", "Loops", "Functions",
+    "Modules", "Algorithms", "Recursion", "Inheritance", "Encapsulation",
+    "Polymorphism", "Abstraction", "Iterators", "Generators", "Decorators",
+    "Closures", "Exceptions", "Threads", "Processes", "Sockets", "Queues",
+    "Stacks", "Trees", "Graphs", "Hashing", "Sorting", "Searching"
+]
+VERBS = [
+    "store", "organize", "describe", "control", "simplify", "process",
+    "transform", "represent", "manage", "combine"
+]
+OBJECTS = [
+    "data efficiently", "program flow", "complex systems", "related values",
+    "repeated work", "text input", "numeric results", "shared state",
+    "memory usage", "user requests"
+]
+
+
+def make_corpus(num_sentences, seed=0):
+    """
+    Build synthetic lecture notes with a given number of sentences.
+
+    Each sentence gets a numbered subject, so the keyword vocabulary grows
+    with the corpus like it does for real notes.
+
+    Args:
+        num_sentences (int): Number of sentences to generate
+        seed (int): Seed for reproducible corpora
+
+    Returns:
+        str: Cleaned lecture notes text
+    """
+    rng = random.Random(seed)
+    sentences = []
+
+    for i in range(num_sentences):
+        subject = f"{rng.choice(SUBJECTS)}{i % 997}"
+        sentences.append(f"{subject} {rng.choice(VERBS)} {rng.choice(OBJECTS)}.")
+
+    return ' '.join(sentences)
+
+
+def make_answers(mcqs, num_students, seed=0):
+    """
+    Build random answer sheets for a quiz.
+
+    Args:
+        mcqs (list): List of MCQs
+        num_students (int): Number of answer sheets
+        seed (int): Seed for reproducible answers
+
+    Returns:
+        list: List of answer dictionaries {question_num: answer}
+    """
+    rng = random.Random(seed)
+    return [{i: rng.choice(mcq['options']) for i, mcq in enumerate(mcqs, 1)}
+            for _ in range(num_students)]
+
+
+def measure(func, *args, repeat=3):
+    """
+    Time a function and measure its peak traced memory.
+
+    The best of several untraced runs is reported as the time; one extra
+    run under tracemalloc gives the peak memory.
+
+    Args:
+        func (callable): Function to benchmark
+        *args: Arguments for the function
+        repeat (int): Number of timed runs
+
+    Returns:
+        tuple: (result, best seconds, peak bytes)
+    """
+    best = float('inf')
+    result = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return result, best, peak
+
+
+def benchmark_size(num_sentences, num_questions=200, num_students=100, repeat=3):
+    """
+    Benchmark every pipeline stage on one corpus size.
+
+    Args:
+        num_sentences (int): Sentences in the synthetic corpus
+        num_questions (int): Questions per generated quiz
+        num_students (int): Answer sheets graded per run
+        repeat (int): Timed runs per stage
+
+    Returns:
+        list: One result dict per stage (stage, items, seconds,
+            items_per_sec, peak_bytes)
+    """
+    text = make_corpus(num_sentences)
+    results = []
+
+    def record(stage, items, func, *args):
+        value, seconds, peak = measure(func, *args, repeat=repeat)
+        results.append({
+            "stage": stage,
+            "sentences": num_sentences,
+            "items": items,
+            "seconds": seconds,
+            "items_per_sec": items / seconds if seconds > 0 else 0.0,
+            "peak_bytes": peak
+        })
+        return value
+
+    sentences = record("split_into_sentences", num_sentences,
+                       qa_generator.split_into_sentences, text)
+
+    record("extract_keyword", len(sentences),
+           lambda: [qa_generator.extract_keyword(s) for s in sentences])
+
+    index = record("build_keyword_index", len(sentences),
+                   qa_generator.build_keyword_index, sentences)
+
+    record("create_distractors", num_questions,
+           lambda: [qa_generator.create_distractors(index['sentence_keywords'][s],
+                                                    sentences, s, index)
+                    for s in sentences[:num_questions]])
+
+    mcqs = record("generate_mcqs", num_questions,
+                  qa_generator.generate_mcqs, text, num_questions, 0)
+
+    answer_sheets = make_answers(mcqs, num_students)
+
+    graded = record("grade_quiz", num_students * len(mcqs),
+                    lambda: [grader.grade_quiz(mcqs, sheet) for sheet in answer_sheets])
+
+    record("grade_batch", num_students * len(mcqs),
+           grader.grade_batch, mcqs, answer_sheets)
+
+    record("generate_report", num_students,
+           lambda: [report.generate_report(results_, mcqs, sheet)
+                    for results_, sheet in zip(graded, answer_sheets)])
+
+    return results
+
+
+def run_benchmarks(sizes, num_questions=200, num_students=100, repeat=3):
+    """
+    Run the benchmark suite over several corpus sizes.
+
+    Args:
+        sizes (list): Corpus sizes in sentences
+        num_questions (int): Questions per generated quiz
+        num_students (int): Answer sheets graded per run
+        repeat (int): Timed runs per stage
+
+    Returns:
+        dict: Machine-readable results with run metadata
+    """
+    stages = []
+
+    for size in sizes:
+        print(f"Benchmarking {size} sentences...")
+        stages.extend(benchmark_size(size, num_questions, num_students, repeat))
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "num_questions": num_questions,
+        "num_students": num_students,
+        "repeat": repeat,
+        "results": stages
+    }
+
+
+def compare_results(baseline, current):
+    """
+    Compare two benchmark runs stage by stage.
+
+    Args:
+        baseline (dict): Earlier results from run_benchmarks()
+        current (dict): New results from run_benchmarks()
+
+    Returns:
+        list: (stage, sentences, baseline seconds, current seconds, ratio)
+    """
+    previous = {(r['stage'], r['sentences']): r for r in baseline['results']}
+    rows = []
+
+    for result in current['results']:
+        old = previous.get((result['stage'], result['sentences']))
+        if old is None:
+            continue
+        ratio = result['seconds'] / old['seconds'] if old['seconds'] > 0 else 0.0
+        rows.append((result['stage'], result['sentences'],
+                     old['seconds'], result['seconds'], ratio))
+
+    return rows
+
+
+def print_results(data, comparison=None):
+    """
+    Print benchmark results as a table.
+
+    Args:
+        data (dict): Results from run_benchmarks()
+        comparison (list): Rows from compare_results() (optional)
+    """
+    print("\n" + "="*78)
+    print("BENCHMARK RESULTS".center(78))
+    print("="*78)
+    print(f"{'Stage':<22}{'Sentences':>11}{'Seconds':>12}{'Items/sec':>16}{'Peak MB':>11}")
+    print("-"*78)
+
+    for r in data['results']:
+        print(f"{r['stage']:<22}{r['sentences']:>11}{r['seconds']:>12.4f}"
+              f"{r['items_per_sec']:>16.0f}{r['peak_bytes'] / 1e6:>11.2f}")
+
+    if comparison:
+        print("\n" + "-"*78)
+        print(f"{'Stage':<22}{'Sentences':>11}{'Baseline':>12}{'Current':>12}{'Ratio':>10}")
+        print("-"*78)
+        for stage, sentences, old, new, ratio in comparison:
+            flag = "  slower" if ratio > 1.1 else ""
+            print(f"{stage:<22}{sentences:>11}{old:>12.4f}{new:>12.4f}{ratio:>10.2f}{flag}")
+
+    print("="*78 + "\n")
+
+
+def main():
+    """
+    Command-line entry point for the benchmark suite.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the quiz pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Corpus sizes in sentences (default: 1000 10000 100000)")
+    parser.add_argument("--questions", type=int, default=200,
+                        help="Questions per quiz (default: 200)")
+    parser.add_argument("--students", type=int, default=100,
+                        help="Answer sheets per grading run (default: 100)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed runs per stage (default: 3)")
+    parser.add_argument("-o", "--output", default="benchmark_results.json",
+                        help="JSON results file (default: benchmark_results.json)")
+    parser.add_argument("--compare", default=None,
+                        help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    data = run_benchmarks(args.sizes, args.questions, args.students, args.repeat)
+
+    comparison = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            comparison = compare_results(json.load(file), data)
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2)
+
+    print_results(data, comparison)
+    print(f"✓ Results written to {args.output}")
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Module: cache.py
+Purpose: Content-addressed on-disk cache of sentence splits, keyword indexes and MCQs
+"""
+
+import hashlib
+import json
+import os
+
+import mcq
+import qa_generator
+
+
+# Bump when the cached data layout changes so stale entries are never read
+CACHE_VERSION = 9
+
+DEFAULT_CACHE_DIR = ".quiz_cache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def get_or_generate(text, num_questions=5, seed=None, cache_dir=DEFAULT_CACHE_DIR,
+                    max_bytes=DEFAULT_MAX_BYTES, df_index=None, sections=None):
+    """
+    Return MCQs for the text, generating and caching them on a miss.
+
+    Entries are keyed by a hash of the cleaned text plus the generation
+    parameters, so editing the notes automatically produces new keys and
+    the old entries age out through LRU eviction. Without a seed only the
+    sentence split and keyword index come from the cache; the questions
+    are drawn fresh on every call, so unseeded banks stay random.
+
+    Args:
+        text (str): Cleaned lecture notes text (from ingest.load_notes)
+        num_questions (int): Number of questions to generate
+        seed (int): Seed for reproducible generation (optional)
+        cache_dir (str): Directory holding the cache entries
+        max_bytes (int): Maximum total size of the cache directory
+        df_index (dict): Corpus statistics for TF-IDF keywords (optional)
+        sections (list): Section ranges from ingest.build_document() (optional)
+
+    Returns:
+        list: List of MCQ objects
+    """
+    mcq_key = None
+    if seed is not None:
+        mcq_key = _hash(document_key(text, df_index, sections), num_questions, seed)
+
+        entry = _read_entry(cache_dir, mcq_key)
+        if entry is not None:
+            return mcq.from_dicts(entry['mcqs'])
+
+    sentences, index = load_document(text, cache_dir, max_bytes, df_index, sections)
+
+    if len(sentences) == 0:
+        print("Error: No sentences found in text!")
+        return []
+
+    mcqs = qa_generator.generate_mcqs_from_index(sentences, index, num_questions, seed=seed)
+
+    if mcq_key is not None:
+        _write_entry(cache_dir, mcq_key, {"mcqs": mcq.to_dicts(mcqs)}, max_bytes)
+    return mcqs
+
+
+def load_document(text, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                  df_index=None, sections=None):
+    """
+    Return the sentence split and keyword index for the text, cached on disk.
+
+    Args:
+        text (str): Cleaned lecture notes text
+        cache_dir (str): Directory holding the cache entries
+        max_bytes (int): Maximum total size of the cache directory
+        df_index (dict): Corpus statistics for TF-IDF keywords (optional)
+        sections (list): Section ranges from ingest.build_document() (optional)
+
+    Returns:
+        tuple: (sentences, index) as produced by qa_generator
+    """
+    doc_key = document_key(text, df_index, sections)
+
+    entry = _read_entry(cache_dir, doc_key)
+    if entry is not None:
+        return entry['sentences'], qa_generator.index_from_json(entry['index'])
+
+    sentences, index = qa_generator.split_and_index(text, df_index, sections)
+
+    entry = {
+        "sentences": sentences,
+        "index": qa_generator.index_to_json(index)
+    }
+    _write_entry(cache_dir, doc_key, entry, max_bytes)
+
+    return sentences, index
+
+
+def document_key(text, df_index=None, sections=None):
+    """
+    Compute the content hash identifying a cleaned document.
+
+    Headings are not part of the cleaned text, so the section ranges are
+    hashed as well when given.
+
+    Args:
+        text (str): Cleaned lecture notes text
+        df_index (dict): Corpus statistics the keywords depend on (optional)
+        sections (list): Section ranges from ingest.build_document() (optional)
+
+    Returns:
+        str: Hex digest of the text (and DF index digest and sections)
+    """
+    parts = [text]
+    if df_index is not None:
+        parts.append(df_index['digest'])
+    if sections is not None:
+        parts.append(json.dumps(sections, sort_keys=True))
+    return _hash(*parts)
+
+
+def evict(cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Delete least recently used entries until the cache fits in max_bytes.
+
+    Args:
+        cache_dir (str): Directory holding the cache entries
+        max_bytes (int): Maximum total size of the cache directory
+
+    Returns:
+        int: Number of entries removed
+    """
+    entries = []
+    total = 0
+
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    # Oldest access time first
+    entries.sort()
+
+    removed = 0
+    for mtime, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+
+    return removed
+
+
+def clear_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Delete every entry in the cache.
+
+    Args:
+        cache_dir (str): Directory holding the cache entries
+    """
+    if not os.path.isdir(cache_dir):
+        return
+
+    for name in os.listdir(cache_dir):
+        if name.endswith(".json"):
+            os.remove(os.path.join(cache_dir, name))
+
+
+def _hash(*parts):
+    """
+    Hash the cache version and the given parts into a hex key.
+
+    Each part is hashed with its type name, so seed=1 and seed="1" (which
+    seed random.Random differently) get different keys.
+    """
+    digest = hashlib.sha256(str(CACHE_VERSION).encode('utf-8'))
+    for part in parts:
+        digest.update(b'\0')
+        digest.update(type(part).__name__.encode('utf-8'))
+        digest.update(b':')
+        digest.update(str(part).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _read_entry(cache_dir, key):
+    """
+    Read a cache entry and mark it as recently used.
+
+    Returns:
+        dict: Entry data, or None on a miss
+    """
+    path = os.path.join(cache_dir, key + ".json")
+
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            entry = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    # The modification time doubles as the LRU timestamp
+    try:
+        os.utime(path, None)
+    except FileNotFoundError:
+        pass
+
+    return entry
+
+
+def _write_entry(cache_dir, key, entry, max_bytes):
+    """
+    Atomically write a cache entry, then enforce the size bound.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    path = os.path.join(cache_dir, key + ".json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(entry, file)
+    os.replace(tmp_path, path)
+
+    evict(cache_dir, max_bytes)
+
+
+# Test function (optional - for module testing)
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    import ingest
+
+    notes = ingest.load_notes("data/lecture_notes.txt")
+    test_dir = tempfile.mkdtemp()
+
+    start = time.perf_counter()
+    first = get_or_generate(notes, 5, seed=42, cache_dir=test_dir)
+    miss_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    second = get_or_generate(notes, 5, seed=42, cache_dir=test_dir)
+    hit_time = time.perf_counter() - start
+
+    print(f"Miss: {miss_time * 1000:.2f} ms, hit: {hit_time * 1000:.2f} ms")
+    print(f"Same bank served from cache: {first == second}")
@@ -0,0 +1,260 @@
+"""
+Module: dedup.py
+Purpose: Find and remove near-duplicate questions with MinHash signatures and LSH
+"""
+
+import argparse
+import json
+import string
+import zlib
+from array import array
+
+import bank_format
+import mcq
+
+
+# Signature length and its split into LSH bands; two questions become
+# candidates when all rows of at least one band agree
+NUM_BINS = 32
+BANDS = 8
+ROWS = NUM_BINS // BANDS
+
+SHINGLE_SIZE = 4
+
+# Questions whose estimated Jaccard similarity reaches this are duplicates
+DEFAULT_THRESHOLD = 0.8
+
+_BIN_BITS = 5
+_VALUE_BITS = 32 - _BIN_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_EMPTY = 1 << 32
+_STRIP = str.maketrans(string.punctuation, ' ' * len(string.punctuation))
+
+
+def normalize(text):
+    """
+    Normalize text before shingling (lowercase, no punctuation, single spaces).
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        str: Normalized text
+    """
+    return ' '.join(text.lower().translate(_STRIP).split())
+
+
+def question_key(question):
+    """
+    Get the texts a question is compared by.
+
+    Args:
+        question (MCQ or dict): Question
+
+    Returns:
+        tuple: (normalized question text, normalized answer)
+    """
+    return normalize(question['question']), normalize(question['answer'])
+
+
+def signature(text):
+    """
+    Compute the MinHash signature of a text's character shingles.
+
+    Uses one-permutation hashing: every shingle is hashed once, the hash
+    picks one of NUM_BINS bins and the rest of it is the value; each bin
+    keeps its minimum. Empty bins borrow from the next non-empty bin, so
+    the cost is linear in the text length.
+
+    Args:
+        text (str): Normalized text
+
+    Returns:
+        list: NUM_BINS integers
+    """
+    data = text.encode('utf-8')
+    sig = [_EMPTY] * NUM_BINS
+
+    for i in range(max(1, len(data) - SHINGLE_SIZE + 1)):
+        # crc32 is a bijection on 4-byte shingles; the multiply mixes bits
+        h = (zlib.crc32(data[i:i + SHINGLE_SIZE]) * 0x9E3779B1) & 0xFFFFFFFF
+        b = h >> _VALUE_BITS
+        v = h & _VALUE_MASK
+        if v < sig[b]:
+            sig[b] = v
+
+    return _densify(sig)
+
+
+def similarity(sig_a, sig_b):
+    """
+    Estimate the Jaccard similarity of two signatures.
+
+    Args:
+        sig_a (sequence): Signature from signature()
+        sig_b (sequence): Signature from signature()
+
+    Returns:
+        float: Share of equal bins (0.0 - 1.0)
+    """
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_BINS
+
+
+def find_duplicates(mcqs, threshold=DEFAULT_THRESHOLD):
+    """
+    Group near-duplicate questions.
+
+    Questions are duplicates when they have the same answer and similar
+    question text; questions that only share a template ("What is ...?")
+    but ask for different answers are kept apart. Every question is hashed
+    into one bucket per LSH band (keyed by band and answer) and compared
+    only with the first question seen in each of its buckets, so the work
+    grows linearly with the number of questions. Matches are merged with
+    union-find, and each group is represented by its earliest question.
+
+    Args:
+        mcqs (iterable): Questions (objects or dictionaries)
+        threshold (float): Minimum estimated similarity of duplicates
+
+    Returns:
+        list: Position of each question's representative (its own
+            position when it is not a duplicate)
+    """
+    signatures = array('I')
+    buckets = [{} for _ in range(BANDS)]
+    parent = []
+
+    def find(i):
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    for i, question in enumerate(mcqs):
+        text, answer = question_key(question)
+        sig = array('I', signature(text))
+        signatures.extend(sig)
+        parent.append(i)
+        key_bytes = sig.tobytes()
+        band_size = len(key_bytes) // BANDS
+        answer = answer.encode('utf-8')
+
+        for band, bucket in enumerate(buckets):
+            key = key_bytes[band * band_size:(band + 1) * band_size] + answer
+            first = bucket.setdefault(key, i)
+            if first == i:
+                continue
+
+            root_i, root_first = find(i), find(first)
+            if root_i == root_first:
+                continue
+
+            other = signatures[first * NUM_BINS:(first + 1) * NUM_BINS]
+            if similarity(sig, other) >= threshold:
+                # The earlier question stays the representative
+                parent[max(root_i, root_first)] = min(root_i, root_first)
+
+    return [find(i) for i in range(len(parent))]
+
+
+def dedupe_mcqs(mcqs, threshold=DEFAULT_THRESHOLD):
+    """
+    Remove near-duplicate questions, keeping the first of each group.
+
+    Args:
+        mcqs (list): Questions (objects or dictionaries)
+        threshold (float): Minimum estimated similarity of duplicates
+
+    Returns:
+        tuple: (kept questions in their original order, number removed)
+    """
+    representatives = find_duplicates(mcqs, threshold)
+    kept = [question for i, question in enumerate(mcqs) if representatives[i] == i]
+
+    return kept, len(mcqs) - len(kept)
+
+
+def load_bank(path):
+    """
+    Load a JSON or binary question bank.
+
+    Args:
+        path (str): Bank file (.json or .qbank)
+
+    Returns:
+        list: List of MCQ objects
+    """
+    if path.endswith(bank_format.BANK_EXTENSION):
+        return bank_format.read_bank(path)
+
+    with open(path, 'r', encoding='utf-8') as file:
+        return mcq.from_dicts(json.load(file))
+
+
+def save_bank(mcqs, path):
+    """
+    Save a question bank as JSON or binary, by file extension.
+
+    Args:
+        mcqs (list): List of MCQ objects or dictionaries
+        path (str): Bank file (.json or .qbank)
+    """
+    if path.endswith(bank_format.BANK_EXTENSION):
+        bank_format.write_bank(mcqs, path)
+        return
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(mcq.to_dicts(mcqs), file, indent=2)
+
+
+def _densify(sig):
+    """
+    Fill empty bins from the next non-empty bin (rotation densification).
+    """
+    if all(v == _EMPTY for v in sig):
+        return [0] * NUM_BINS
+
+    for i in range(NUM_BINS):
+        if sig[i] == _EMPTY:
+            distance = 1
+            while sig[(i + distance) % NUM_BINS] == _EMPTY:
+                distance += 1
+            # Offset by the distance so borrowed values never look original
+            sig[i] = (sig[(i + distance) % NUM_BINS] & _VALUE_MASK) | (distance << _VALUE_BITS)
+
+    return sig
+
+
+def main():
+    """
+    Command-line entry point to merge and deduplicate question banks.
+    """
+    parser = argparse.ArgumentParser(
+        description="Merge question banks and remove near-duplicate questions.")
+    parser.add_argument("banks", nargs="+", help="Input banks (.json or .qbank)")
+    parser.add_argument("-o", "--output", required=True,
+                        help="Merged bank (.json or .qbank)")
+    parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Similarity threshold (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    mcqs = []
+    for path in args.banks:
+        try:
+            mcqs.extend(load_bank(path))
+        except (OSError, ValueError) as e:
+            print(f"Error reading bank '{path}': {e}")
+            return
+
+    kept, removed = dedupe_mcqs(mcqs, args.threshold)
+    save_bank(kept, args.output)
+
+    print(f"✓ {len(mcqs)} questions read, {removed} near-duplicates removed")
+    print(f"✓ {len(kept)} questions written to {args.output}")
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,16 @@ Module: grader.py
 Purpose: Compare user answers with correct answers and calculate score
 """
 
+import operator
+from array import array
+
 
 def grade_quiz(mcqs, user_answers):
     """
     Grade the quiz by comparing user answers with correct answers.
     
     Args:
-        mcqs (list): List of MCQ dictionaries with correct answers
+        mcqs (list): List of MCQs (objects or dictionaries) with correct answers
         user_answers (dict): Dictionary of user's answers {question_num: answer}
         
     Returns:
@@ -40,7 +43,8 @@ def grade_quiz(mcqs, user_answers):
             "user_answer": user_answer,
             "correct_answer": correct_answer,
             "is_correct": is_correct,
-            "keyword": mcq.get('keyword', '')
+            "keyword": mcq.get('keyword', ''),
+            "section": mcq.get('section', '')
         }
         details.append(detail)
     
@@ -77,6 +81,186 @@ def calculate_percentage(correct, total):
     return round(percentage, 2)
 
 
+def encode_answer_key(mcqs):
+    """
+    Normalize the answer key of a quiz once for bulk grading.
+    
+    Args:
+        mcqs (list): List of MCQs (objects or dictionaries) with correct answers
+        
+    Returns:
+        dict: Answer key with:
+            answers (array): Correct option index per question
+            option_maps (list): Per question, normalized option text -> index
+    """
+    answers = array('b')
+    option_maps = []
+    
+    for mcq in mcqs:
+        option_map = {}
+        for j, option in enumerate(mcq['options']):
+            option_map.setdefault(option.lower().strip(), j)
+        
+        # The correct answer always maps to its own index
+        correct = mcq['answer'].lower().strip()
+        answer_index = option_map.get(correct, len(mcq['options']))
+        option_map[correct] = answer_index
+        
+        answers.append(answer_index)
+        option_maps.append(option_map)
+    
+    return {"answers": answers, "option_maps": option_maps}
+
+
+def encode_answers(answer_key, user_answers):
+    """
+    Encode one student's text answers as option indices.
+    
+    Args:
+        answer_key (dict): Answer key from encode_answer_key()
+        user_answers (dict): Dictionary of user's answers {question_num: answer}
+        
+    Returns:
+        array: Option index per question (-1 if unanswered or unknown)
+    """
+    encoded = array('b')
+    
+    for i, option_map in enumerate(answer_key['option_maps'], 1):
+        answer = user_answers.get(i, "")
+        encoded.append(option_map.get(answer.lower().strip(), -1))
+    
+    return encoded
+
+
+def grade_batch(mcqs, answer_sheets, details=False):
+    """
+    Grade many students' answer sheets for the same quiz at once.
+    
+    The answer key is normalized a single time, answers are compared as
+    option indices and the scores are returned as a compact matrix.
+    
+    Args:
+        mcqs (list): List of MCQs (objects or dictionaries) with correct answers
+        answer_sheets (list): One entry per student, either a dict of text
+            answers {question_num: answer} like grade_quiz(), or a sequence
+            of 0-based option indices (-1 for unanswered)
+        details (bool): Also build grade_quiz()-style results per student
+        
+    Returns:
+        dict: Batch results with:
+            num_students (int), num_questions (int)
+            matrix (bytearray): Row-major students x questions, 1 if correct
+            correct (array): Correct answers per student
+            percentages (array): Percentage score per student
+            details (list): Per-student grade_quiz() results (only if requested)
+    """
+    answer_key = encode_answer_key(mcqs)
+    key = answer_key['answers']
+    num_questions = len(key)
+    
+    matrix = bytearray()
+    correct = array('I')
+    percentages = array('d')
+    detail_sheets = []
+    
+    for sheet in answer_sheets:
+        if isinstance(sheet, dict):
+            encoded = encode_answers(answer_key, sheet)
+        else:
+            encoded = sheet
+        
+        # Element-wise comparison against the key, evaluated in C
+        row = bytearray(map(operator.eq, encoded, key))
+        row.extend(bytes(num_questions - len(row)))
+        
+        row_correct = row.count(1)
+        matrix += row
+        correct.append(row_correct)
+        percentages.append(calculate_percentage(row_correct, num_questions))
+        
+        if details:
+            detail_sheets.append((sheet, row, row_correct))
+    
+    batch = {
+        "num_students": len(correct),
+        "num_questions": num_questions,
+        "matrix": matrix,
+        "correct": correct,
+        "percentages": percentages
+    }
+    
+    # Per-question detail records are only built on request, from the
+    # matrix row and the answers as submitted
+    if details:
+        questions = [(mcq['question'], mcq['answer'], mcq.get('keyword', ''),
+                      mcq.get('section', ''), mcq['options']) for mcq in mcqs]
+        batch["details"] = [_batch_results(questions, sheet, row, row_correct)
+                            for sheet, row, row_correct in detail_sheets]
+    
+    return batch
+
+
+def _batch_results(questions, sheet, row, row_correct):
+    """
+    Build grade_quiz()-style results for one answer sheet of a batch.
+    
+    Text sheets keep each answer exactly as submitted; index sheets show
+    the text of the chosen option.
+    """
+    details = []
+    
+    for i, (question, correct_answer, keyword, section, options) in enumerate(questions, 1):
+        if isinstance(sheet, dict):
+            user_answer = sheet.get(i, "")
+        else:
+            index = sheet[i - 1] if i <= len(sheet) else -1
+            if 0 <= index < len(options):
+                user_answer = options[index]
+            elif index == len(options):
+                # Index of a correct answer missing from the options
+                user_answer = correct_answer
+            else:
+                user_answer = ""
+        
+        details.append({
+            "question_num": i,
+            "question": question,
+            "user_answer": user_answer,
+            "correct_answer": correct_answer,
+            "is_correct": row[i - 1] == 1,
+            "keyword": keyword,
+            "section": section
+        })
+    
+    return {
+        "total": len(questions),
+        "correct": row_correct,
+        "wrong": len(questions) - row_correct,
+        "percentage": calculate_percentage(row_correct, len(questions)),
+        "details": details
+    }
+
+
+def decode_answers(mcqs, encoded):
+    """
+    Convert option indices back into a text answer dictionary.
+    
+    Args:
+        mcqs (list): List of MCQs (objects or dictionaries)
+        encoded (sequence): Option index per question (-1 if unanswered)
+        
+    Returns:
+        dict: Dictionary of answers {question_num: answer}
+    """
+    user_answers = {}
+    
+    for i, (mcq, index) in enumerate(zip(mcqs, encoded), 1):
+        if 0 <= index < len(mcq['options']):
+            user_answers[i] = mcq['options'][index]
+    
+    return user_answers
+
+
 # Test function (optional - for module testing)
 if __name__ == "__main__":
     # Test data
@@ -108,3 +292,7 @@ if __name__ == "__main__":
     print(f"Correct: {results['correct']}")
     print(f"Wrong: {results['wrong']}")
     print(f"Percentage: {results['percentage']}%")
+    
+    # Grade a batch of students at once
+    batch = grade_batch(test_mcqs, [test_answers, {1: "a snake"}, [0, 0]])
+    print(f"\nBatch percentages: {list(batch['percentages'])}")
@@ -0,0 +1,469 @@
+"""
+Module: grading_service.py
+Purpose: Grade bursts of submitted answer sheets in micro-batches (asyncio, stdlib only)
+
+Submissions wait in a bounded queue. One worker takes whatever has
+arrived (up to a batch size, waiting at most a few milliseconds for more),
+grades the batch with grader.grade_batch and renders the reports in memory
+on a grading thread, then hands the batch to a single writer thread, which appends it to a JSONL
+file and the attempt store in one write each. When the queue is full,
+submit() waits, so a burst slows down submitters instead of growing memory.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import attempt_store
+import grader
+import ingest
+import qa_generator
+import report
+
+
+DEFAULT_MAX_QUEUE = 10000
+DEFAULT_BATCH_SIZE = 256
+
+# Seconds the worker waits for a batch to fill once a submission arrived
+DEFAULT_BATCH_WAIT = 0.005
+
+
+class GradingService:
+    """
+    Asynchronous grader for many concurrent submissions.
+
+    Usage:
+        async with GradingService(mcqs, results_path="results.jsonl") as service:
+            graded = await service.submit("alice", {1: "Python", 2: "Loops"})
+            print(graded['rendered']['text'])
+    """
+
+    def __init__(self, mcqs=None, results_path=None, store_path=None, cohort="",
+                 formats=("text",), max_queue=DEFAULT_MAX_QUEUE,
+                 batch_size=DEFAULT_BATCH_SIZE, batch_wait=DEFAULT_BATCH_WAIT):
+        """
+        Create a grading service (call start(), or use it as an async
+        context manager).
+
+        Args:
+            mcqs (list): Quiz graded when a submission names no quiz (optional)
+            results_path (str): JSONL file graded results are appended to (optional)
+            store_path (str): Attempt store database to record answers in (optional)
+            cohort (str): Cohort stored with the attempts
+            formats (tuple): Report formats rendered per submission
+                (see report.RENDERERS)
+            max_queue (int): Submissions that may wait before submit() blocks
+            batch_size (int): Maximum submissions graded together
+            batch_wait (float): Seconds to wait for a batch to fill
+        """
+        for report_format in formats:
+            if report_format not in report.RENDERERS:
+                raise ValueError(f"Unknown report format '{report_format}'")
+
+        self.mcqs = mcqs
+        self.results_path = results_path
+        self.store_path = store_path
+        self.cohort = cohort
+        self.formats = tuple(formats)
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+
+        self._queue = asyncio.Queue(max_queue)
+        self._worker = None
+        self._grader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="grading-worker")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="grading-writer")
+        self._results_file = None
+        self._store = None
+
+        self._stats = {
+            "submitted": 0,
+            "graded": 0,
+            "failed": 0,
+            "rejected": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "writes": 0,
+            "latency_seconds": 0.0,
+            "max_latency_seconds": 0.0,
+            "max_queue": 0
+        }
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def start(self):
+        """
+        Start the batching worker on the running event loop.
+        """
+        if self._worker is None:
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, student, answers, mcqs=None):
+        """
+        Submit one answer sheet and wait until it is graded and written.
+
+        Waits for room in the queue when it is full (backpressure).
+
+        Args:
+            student (str): Student identifier
+            answers (dict): Answers {question_num: answer}, as for grader.grade_quiz()
+            mcqs (list): Quiz the answers belong to (default: the service quiz)
+
+        Returns:
+            dict: student, results (grader.grade_quiz() format), report
+                (report.generate_report() data) and rendered reports by format
+        """
+        future = self._make_item_future()
+        await self._queue.put((self._get_quiz(mcqs), student, answers, future, time.perf_counter()))
+        self._count_submission()
+        return await future
+
+    def submit_nowait(self, student, answers, mcqs=None):
+        """
+        Submit one answer sheet without waiting for room in the queue.
+
+        Args:
+            student (str): Student identifier
+            answers (dict): Answers {question_num: answer}
+            mcqs (list): Quiz the answers belong to (default: the service quiz)
+
+        Returns:
+            asyncio.Future: Resolves to the same dictionary as submit()
+
+        Raises:
+            asyncio.QueueFull: If the queue is full (the caller should shed load)
+        """
+        future = self._make_item_future()
+        try:
+            self._queue.put_nowait((self._get_quiz(mcqs), student, answers, future,
+                                    time.perf_counter()))
+        except asyncio.QueueFull:
+            self._stats['rejected'] += 1
+            raise
+        self._count_submission()
+        return future
+
+    async def close(self):
+        """
+        Grade and write everything already submitted, then stop.
+        """
+        if self._worker is not None:
+            await self._queue.put(None)
+            await self._worker
+            self._worker = None
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer, self._close_outputs)
+        self._grader.shutdown()
+        self._writer.shutdown()
+
+    def stats(self):
+        """
+        Get the service counters.
+
+        Returns:
+            dict: submitted, graded, failed (malformed submissions),
+                rejected, batches, max_batch, writes,
+                mean/max latency (submit to written) and the queue depth
+        """
+        stats = dict(self._stats)
+        stats['queued'] = self._queue.qsize()
+        stats['mean_batch'] = round(stats['graded'] / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['mean_latency_seconds'] = (stats['latency_seconds'] / stats['graded']
+                                         if stats['graded'] else 0.0)
+        return stats
+
+    def _get_quiz(self, mcqs):
+        """
+        Resolve the quiz of a submission.
+        """
+        mcqs = self.mcqs if mcqs is None else mcqs
+        if mcqs is None:
+            raise ValueError("No quiz given for the submission")
+        return mcqs
+
+    def _make_item_future(self):
+        """
+        Create the future a submission's result is delivered through.
+        """
+        if self._worker is None:
+            raise RuntimeError("Grading service is not started")
+        return asyncio.get_running_loop().create_future()
+
+    def _count_submission(self):
+        """
+        Count an accepted submission and track the queue high-water mark.
+        """
+        self._stats['submitted'] += 1
+        if self._queue.qsize() > self._stats['max_queue']:
+            self._stats['max_queue'] = self._queue.qsize()
+
+    async def _run(self):
+        """
+        Collect, grade and hand off micro-batches until the stop marker.
+        """
+        loop = asyncio.get_running_loop()
+        writing = None
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            # Grading and rendering run off the event loop, so connections
+            # stay responsive while a large batch is processed
+            try:
+                graded = await loop.run_in_executor(self._grader, self._grade, batch)
+            except Exception as e:
+                for _, _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            # Submissions that could not be graded fail on their own
+            if any(isinstance(result, Exception) for result in graded):
+                ok = []
+                for item, result in zip(batch, graded):
+                    if not isinstance(result, Exception):
+                        ok.append((item, result))
+                    elif not item[3].done():
+                        self._stats['failed'] += 1
+                        item[3].set_exception(result)
+                if not ok:
+                    continue
+                batch, graded = [item for item, _ in ok], [result for _, result in ok]
+
+            # At most one batch is being written while the next is graded
+            if writing is not None:
+                await writing
+            writing = loop.create_task(self._write(batch, graded))
+
+        if writing is not None:
+            await writing
+
+    def _grade(self, batch):
+        """
+        Grade a batch, one grade_batch() call per quiz, and render the
+        reports (runs on the grading thread).
+
+        If a quiz's sheets fail together, they are graded one by one so
+        that only the malformed submissions fail.
+
+        Returns:
+            list: Graded dictionary (or the exception raised) per
+                submission, in batch order
+        """
+        by_quiz = {}
+        for position, (mcqs, _, answers, _, _) in enumerate(batch):
+            by_quiz.setdefault(id(mcqs), (mcqs, []))[1].append(position)
+
+        graded = [None] * len(batch)
+        for mcqs, positions in by_quiz.values():
+            try:
+                self._grade_quiz(batch, mcqs, positions, graded)
+            except Exception:
+                for position in positions:
+                    try:
+                        self._grade_quiz(batch, mcqs, [position], graded)
+                    except Exception as e:
+                        graded[position] = e
+
+        return graded
+
+    def _grade_quiz(self, batch, mcqs, positions, graded):
+        """
+        Grade the submissions of one quiz and store them in graded.
+        """
+        results = grader.grade_batch(mcqs, [batch[p][2] for p in positions],
+                                     details=True)['details']
+
+        entries = []
+        for position, student_results in zip(positions, results):
+            report_data = report.generate_report(student_results, mcqs, batch[position][2])
+            entries.append({
+                "student": batch[position][1],
+                "results": student_results,
+                "report": report_data,
+                "rendered": {report_format: report.render_report(report_data, report_format)
+                             for report_format in self.formats}
+            })
+
+        # Stored only once every submission of the group succeeded
+        for position, entry in zip(positions, entries):
+            graded[position] = entry
+
+    async def _write(self, batch, graded):
+        """
+        Write a graded batch on the writer thread, then resolve its futures.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._writer, self._write_outputs, graded)
+        except Exception as e:
+            for _, _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        now = time.perf_counter()
+        stats = self._stats
+        stats['writes'] += 1
+        stats['batches'] += 1
+        stats['graded'] += len(batch)
+        stats['max_batch'] = max(stats['max_batch'], len(batch))
+
+        for (_, _, _, future, submitted), result in zip(batch, graded):
+            latency = now - submitted
+            stats['latency_seconds'] += latency
+            if latency > stats['max_latency_seconds']:
+                stats['max_latency_seconds'] = latency
+            if not future.done():
+                future.set_result(result)
+
+    def _write_outputs(self, graded):
+        """
+        Append a graded batch to the outputs (runs on the writer thread).
+        """
+        if self.results_path:
+            if self._results_file is None:
+                self._results_file = open(self.results_path, 'a', encoding='utf-8')
+            timestamp = time.time()
+            self._results_file.write(''.join(
+                json.dumps({
+                    "student": entry['student'],
+                    "graded": timestamp,
+                    "grade": entry['report']['grade'],
+                    "weak_topics": entry['report']['weak_topics'],
+                    "results": entry['results']
+                }, ensure_ascii=False) + '\n'
+                for entry in graded))
+            self._results_file.flush()
+
+        if self.store_path:
+            # SQLite connections belong to the thread that opened them
+            if self._store is None:
+                self._store = attempt_store.AttemptStore(self.store_path)
+            for entry in graded:
+                self._store.add_results(entry['student'], entry['results'], cohort=self.cohort)
+            self._store.flush()
+
+    def _close_outputs(self):
+        """
+        Close the outputs (runs on the writer thread).
+        """
+        if self._results_file is not None:
+            self._results_file.close()
+            self._results_file = None
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+async def simulate_burst(mcqs, num_students, results_path=None, store_path=None,
+                         formats=("text",), batch_size=DEFAULT_BATCH_SIZE,
+                         max_queue=DEFAULT_MAX_QUEUE, seed=None):
+    """
+    Submit random answer sheets for many students at once.
+
+    Args:
+        mcqs (list): Quiz every student takes
+        num_students (int): Number of simultaneous submissions
+        results_path (str): JSONL results file (optional)
+        store_path (str): Attempt store database (optional)
+        formats (tuple): Report formats to render
+        batch_size (int): Maximum submissions graded together
+        max_queue (int): Queue bound
+        seed (int): Seed for the random answers (optional)
+
+    Returns:
+        dict: Service statistics plus the total seconds
+    """
+    rng = random.Random(seed)
+    sheets = [{i: rng.choice(mcq['options']) for i, mcq in enumerate(mcqs, 1)}
+              for _ in range(num_students)]
+
+    start = time.perf_counter()
+    async with GradingService(mcqs, results_path, store_path, formats=formats,
+                              max_queue=max_queue, batch_size=batch_size) as service:
+        await asyncio.gather(*(service.submit(f"student{n}", sheet)
+                               for n, sheet in enumerate(sheets)))
+
+    stats = service.stats()
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    """
+    Command-line entry point that grades a simulated burst of submissions.
+    """
+    parser = argparse.ArgumentParser(
+        description="Grade a simulated burst of quiz submissions in micro-batches.")
+    parser.add_argument("--notes", default="data/lecture_notes.txt",
+                        help="Lecture notes file (default: data/lecture_notes.txt)")
+    parser.add_argument("-n", "--students", type=int, default=5000,
+                        help="Number of submissions (default: 5000)")
+    parser.add_argument("-q", "--questions", type=int, default=10,
+                        help="Questions per quiz (default: 10)")
+    parser.add_argument("--results", default=None, help="Append graded results to this JSONL file")
+    parser.add_argument("--store", default=None, help="Record attempts in this SQLite store")
+    parser.add_argument("--formats", default="text",
+                        help=f"Comma-separated report formats ({', '.join(report.RENDERERS)})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Maximum submissions per batch (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help=f"Queue bound (default: {DEFAULT_MAX_QUEUE})")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for quiz and answers")
+    args = parser.parse_args()
+
+    notes = ingest.load_notes(args.notes)
+    if not notes:
+        return
+
+    mcqs = qa_generator.generate_mcqs(notes, args.questions, args.seed)
+    formats = tuple(f for f in args.formats.split(',') if f)
+
+    try:
+        stats = asyncio.run(simulate_burst(mcqs, args.students, args.results, args.store,
+                                           formats, args.batch_size, args.max_queue,
+                                           args.seed))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    print(f"✓ Graded {stats['graded']} submissions in {stats['seconds']:.3f}s "
+          f"({stats['batches']} batches, mean {stats['mean_batch']}, max {stats['max_batch']})")
+    print(f"✓ Latency: mean {stats['mean_latency_seconds'] * 1000:.1f} ms, "
+          f"max {stats['max_latency_seconds'] * 1000:.1f} ms; "
+          f"{stats['writes']} bulk writes, peak queue {stats['max_queue']}")
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Module: incremental.py
+Purpose: Regenerate a question bank incrementally when lecture notes are edited
+"""
+
+import argparse
+import json
+
+import ingest
+import mcq
+import qa_generator
+
+
+# Bump when the stored state layout changes; older states are rebuilt
+STATE_VERSION = 1
+
+
+def regenerate(text, state=None, num_questions=5, seed=None, rng=None):
+    """
+    Update a question bank after the notes changed.
+
+    The new sentences are compared with the sentences indexed in the
+    previous state. Only removed sentences leave the keyword index and
+    only added (or edited) sentences are indexed, so keyword extraction
+    and question generation scale with the size of the edit. Questions
+    for unchanged sentences are kept as they were; questions for removed
+    sentences are replaced, preferring the newly added sentences.
+
+    Args:
+        text (str): Cleaned lecture notes text
+        state (dict): State from the previous run (None for a first run);
+            its keyword index is updated in place
+        num_questions (int): Number of questions in the bank
+        seed (int): Seed for a private random generator (optional)
+        rng (random.Random): Random generator to use instead of a seed (optional)
+
+    Returns:
+        tuple: (mcqs, state, stats) where mcqs is the updated bank, state
+            is passed to the next call and stats counts added, removed,
+            kept and regenerated sentences/questions
+    """
+    rng = qa_generator.get_rng(seed, rng)
+
+    if state is None:
+        index = qa_generator.build_keyword_index([])
+        questions = {}
+    else:
+        index = state['index']
+        questions = dict(state['questions'])
+
+    # Diff the sentence sets; dict keys keep the document order
+    new_sentences = dict.fromkeys(qa_generator.split_into_sentences(text))
+    old_sentences = index['sentence_keywords']
+
+    removed = [s for s in old_sentences if s not in new_sentences]
+    added = [s for s in new_sentences if s not in old_sentences]
+
+    for sentence in removed:
+        qa_generator.remove_from_index(index, sentence)
+        questions.pop(sentence, None)
+
+    for sentence in added:
+        qa_generator.add_to_index(index, sentence)
+
+    kept = len(questions)
+
+    # Shrink the bank if fewer questions are wanted now
+    while len(questions) > num_questions:
+        questions.pop(next(reversed(questions)))
+
+    # Fill free slots from the added sentences first
+    candidates = list(added)
+    rng.shuffle(candidates)
+    regenerated = _fill(questions, candidates, index, num_questions, rng)
+
+    # Only when the edit alone cannot fill the bank, sample the rest
+    if len(questions) < num_questions:
+        others = [s for s in new_sentences if s not in questions]
+        rng.shuffle(others)
+        regenerated += _fill(questions, others, index, num_questions, rng)
+
+    state = {
+        "version": STATE_VERSION,
+        "index": index,
+        "questions": questions
+    }
+
+    stats = {
+        "sentences": len(new_sentences),
+        "added": len(added),
+        "removed": len(removed),
+        "kept": min(kept, num_questions),
+        "regenerated": regenerated
+    }
+
+    return list(questions.values()), state, stats
+
+
+def load_state(path):
+    """
+    Load the state of a previous run.
+
+    Args:
+        path (str): Path of the state file
+
+    Returns:
+        dict: State, or None if the file is missing, unreadable or outdated
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        print(f"Error reading state file: {e}")
+        return None
+
+    if data.get('version') != STATE_VERSION:
+        return None
+
+    return {
+        "version": STATE_VERSION,
+        "index": qa_generator.index_from_json(data['index']),
+        "questions": {sentence: mcq.MCQ.from_dict(question)
+                      for sentence, question in data['questions'].items()}
+    }
+
+
+def save_state(path, state):
+    """
+    Save the state for the next run.
+
+    Args:
+        path (str): Path of the state file
+        state (dict): State from regenerate()
+    """
+    data = {
+        "version": state['version'],
+        "index": qa_generator.index_to_json(state['index']),
+        "questions": {sentence: question.to_dict()
+                      for sentence, question in state['questions'].items()}
+    }
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+
+
+def _fill(questions, candidates, index, num_questions, rng):
+    """
+    Add questions for candidate sentences until the bank is full.
+
+    Returns:
+        int: Number of questions generated
+    """
+    generated = 0
+
+    for sentence in candidates:
+        if len(questions) >= num_questions:
+            break
+        question = qa_generator.create_mcq(sentence, index, rng)
+        if question is not None:
+            questions[sentence] = question
+            generated += 1
+
+    return generated
+
+
+def main():
+    """
+    Command-line entry point for incremental regeneration.
+    """
+    parser = argparse.ArgumentParser(
+        description="Update a question bank after lecture notes were edited.")
+    parser.add_argument("notes", help="Lecture notes file")
+    parser.add_argument("--state", default=None,
+                        help="State file (default: <notes>.state.json)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Bank file (default: <notes>.bank.json)")
+    parser.add_argument("-n", "--num-questions", type=int, default=5,
+                        help="Questions in the bank (default: 5)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for reproducible questions")
+    args = parser.parse_args()
+
+    state_path = args.state or args.notes + ".state.json"
+    output_path = args.output or args.notes + ".bank.json"
+
+    notes = ingest.load_notes(args.notes)
+
+    if not notes:
+        print("Failed to load lecture notes. Exiting.")
+        return
+
+    mcqs, state, stats = regenerate(notes, load_state(state_path),
+                                    args.num_questions, args.seed)
+
+    save_state(state_path, state)
+    with open(output_path, 'w', encoding='utf-8') as file:
+        json.dump(mcq.to_dicts(mcqs), file, indent=2)
+
+    print(f"✓ {stats['sentences']} sentences: {stats['added']} added, "
+          f"{stats['removed']} removed")
+    print(f"✓ {stats['kept']} questions kept, {stats['regenerated']} regenerated")
+    print(f"✓ Bank written to {output_path}")
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
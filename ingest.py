@@ -1,12 +1,74 @@
 """
 Module: ingest.py
-Purpose: Load and clean lecture notes from text file
+Purpose: Load and clean lecture notes from text, Markdown, HTML, DOCX and PDF-text files
 """
 
+import io
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+from xml.etree import ElementTree
+
+import tokenizer
+
+
+class IngestError(Exception):
+    """
+    Error raised when a notes file cannot be read or parsed.
+    """
+
+    def __init__(self, path, message):
+        super().__init__(f"{path}: {message}")
+        self.path = path
+        self.message = message
+
+
+# Format parsers, filled by register_parser(): name -> function(bytes) -> str or blocks
+PARSERS = {}
+
+# File extension -> format name
+EXTENSIONS = {}
+
+# Block kinds a parser can return instead of plain text
+HEADING = "heading"
+TEXT = "text"
+
+# Longest stand-alone line of plain text that is taken as a heading
+MAX_HEADING_WORDS = 8
+
+
+def register_parser(name, extensions=()):
+    """
+    Register a parser for a notes format (usable as a decorator).
+    
+    A parser takes the raw file bytes and returns plain text, or a list of
+    (HEADING or TEXT, text) blocks when the format marks its headings. Any
+    exception it raises (ValueError, zlib.error, ...) is reported as an
+    IngestError for that file.
+    Plain text is split into blocks by _text_blocks().
+    
+    Args:
+        name (str): Format name
+        extensions (iterable): File extensions (with dot) of the format
+        
+    Returns:
+        callable: Decorator registering the parser function
+    """
+    def decorator(parser):
+        PARSERS[name] = parser
+        for extension in extensions:
+            EXTENSIONS[extension.lower()] = name
+        return parser
+    
+    return decorator
+
 
 def load_notes(filepath):
     """
-    Load lecture notes from a text file.
+    Load lecture notes from a file in any supported format.
     
     Args:
         filepath (str): Path to the lecture notes file
@@ -15,19 +77,613 @@ def load_notes(filepath):
         str: Cleaned text content from the file
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as file:
-            text = file.read()
+        return parse_file(filepath)
+    except IngestError as e:
+        if e.message == "file not found":
+            print(f"Error: File '{filepath}' not found!")
+        else:
+            print(f"Error loading file: {e}")
+        return ""
+
+
+def parse_file(filepath, file_format=None):
+    """
+    Read, parse and clean one notes file.
+    
+    Args:
+        filepath (str): Path to the notes file
+        file_format (str): Format name (default: detected)
+        
+    Returns:
+        str: Cleaned text
+        
+    Raises:
+        IngestError: If the file is missing, unreadable or cannot be parsed
+    """
+    return parse_document(filepath, file_format)['text']
+
+
+def load_document(filepath):
+    """
+    Load lecture notes with their sections from a file in any supported format.
+    
+    Args:
+        filepath (str): Path to the lecture notes file
+        
+    Returns:
+        dict: Document from build_document() (empty text on error)
+    """
+    try:
+        return parse_document(filepath)
+    except IngestError as e:
+        if e.message == "file not found":
+            print(f"Error: File '{filepath}' not found!")
+        else:
+            print(f"Error loading file: {e}")
+        return {"text": "", "sections": []}
+
+
+def parse_document(filepath, file_format=None):
+    """
+    Read and parse one notes file, keeping its section structure.
+    
+    Args:
+        filepath (str): Path to the notes file
+        file_format (str): Format name (default: detected)
+        
+    Returns:
+        dict: Document from build_document()
+        
+    Raises:
+        IngestError: If the file is missing, unreadable or cannot be parsed
+    """
+    data = _read_file(filepath)
+    
+    if file_format is None:
+        file_format = detect_format(filepath, data)
+    
+    return _parse(filepath, data, file_format)
+
+
+def build_document(blocks):
+    """
+    Join parsed blocks into cleaned text and its section ranges in one pass.
+    
+    Headings are not part of the text; each one starts a section that runs
+    until the next heading. Text before the first heading forms a section
+    with an empty title. The last sentence of every section is ended, so
+    sentences never span two sections.
+    
+    Args:
+        blocks (iterable): (HEADING or TEXT, text) pairs in document order
+        
+    Returns:
+        dict: Document with the following keys:
+            text (str): Cleaned text, blocks joined by single spaces
+            sections (list): One {"title", "start", "end"} dictionary per
+                non-empty section, with character offsets into text
+    """
+    pieces = []
+    sections = []
+    title = ""
+    start = length = 0
+    
+    for kind, value in blocks:
+        value = clean_text(value)
+        if not value:
+            continue
+        
+        if kind == HEADING:
+            if length > start:
+                last = _end_sentence(pieces[-1])
+                length += len(last) - len(pieces[-1])
+                pieces[-1] = last
+                sections.append({"title": title, "start": start, "end": length})
+            title = value
+            # The next text block starts after the joining space
+            start = length + 1 if pieces else 0
+            continue
+        
+        if pieces:
+            length += 1
+        pieces.append(value)
+        length += len(value)
+    
+    if length > start:
+        sections.append({"title": title, "start": start, "end": length})
+    
+    return {"text": ' '.join(pieces), "sections": sections}
+
+
+def detect_format(filepath, data):
+    """
+    Detect the format of a notes file by extension, then by content.
+    
+    Args:
+        filepath (str): File path
+        data (bytes): File content
+        
+    Returns:
+        str: Format name (see PARSERS)
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension in EXTENSIONS:
+        return EXTENSIONS[extension]
+    
+    if data.startswith(b"%PDF"):
+        return "pdf"
+    if data.startswith(b"PK\x03\x04"):
+        return "docx"
+    
+    head = data[:4096].decode('utf-8', errors='replace')
+    if re.search(r'<(?:!doctype html|html|body|p|h[1-6]|div)\b', head, re.IGNORECASE):
+        return "html"
+    if '\f' in head:
+        return "pdf_text"
+    if re.search(r'^(?:#{1,6} |```|[*-] |\d+\. )', head, re.MULTILINE):
+        return "markdown"
+    return "text"
+
+
+def ingest_files(paths, workers=None, use_processes=False):
+    """
+    Parse many notes files in parallel.
+    
+    Results are yielded as soon as each file is done, so one slow or bad
+    file never holds back the others. Errors are reported in the result
+    instead of being raised.
+    
+    Args:
+        paths (list): Notes file paths
+        workers (int): Pool size (default: executor default)
+        use_processes (bool): Use a process pool (for CPU-heavy parsing of
+            large batches) instead of a thread pool
+        
+    Yields:
+        dict: Result per file with path, format, text, sections, error
+            (None on success) and seconds
+    """
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    
+    with executor_class(max_workers=workers) as executor:
+        futures = [executor.submit(ingest_file, path) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def ingest_file(filepath):
+    """
+    Parse one notes file into a result dictionary.
+    
+    Args:
+        filepath (str): Notes file path
+        
+    Returns:
+        dict: path, format, text, sections, error (None on success) and seconds
+    """
+    start = time.perf_counter()
+    result = {"path": filepath, "format": None, "text": "", "sections": [],
+              "error": None, "seconds": 0.0}
+    
+    try:
+        data = _read_file(filepath)
+        result["format"] = detect_format(filepath, data)
+        document = _parse(filepath, data, result["format"])
+        result["text"] = document["text"]
+        result["sections"] = document["sections"]
+    except IngestError as e:
+        result["error"] = str(e)
+    
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _read_file(filepath):
+    """
+    Read the raw bytes of a notes file.
+    """
+    try:
+        with open(filepath, 'rb') as file:
+            return file.read()
+    except FileNotFoundError:
+        raise IngestError(filepath, "file not found")
+    except OSError as e:
+        raise IngestError(filepath, e.strerror or str(e))
+
+
+def _parse(filepath, data, file_format):
+    """
+    Run the parser of a format and build the cleaned document.
+    """
+    parser = PARSERS.get(file_format)
+    if parser is None:
+        raise IngestError(filepath, f"unsupported format '{file_format}'")
+    
+    try:
+        blocks = parser(data)
+        if isinstance(blocks, str):
+            blocks = _text_blocks(blocks)
+        return build_document(blocks)
+    except IngestError:
+        raise
+    except Exception as e:
+        # Corrupt archives raise zlib.error, bad bytes UnicodeDecodeError,
+        # and so on: whatever the parser hit, only this file fails
+        raise IngestError(filepath, f"cannot parse as {file_format}: {e}")
+
+
+def stream_sentences(filepath, chunk_size=1024 * 1024):
+    """
+    Stream cleaned sentences from a lecture notes file.
+    
+    The file is read line by line (long lines in pieces of at most
+    chunk_size characters) and split once chunk_size characters of text
+    are pending, so memory stays bounded by the chunk size and the longest
+    sentence instead of the file size. Sentences are split like
+    qa_generator.split_into_sentences() and whitespace-normalized like
+    clean_text(); plain-text headings are detected like in load_notes()
+    (see _text_blocks) and end the sentence before them. The first line of
+    a paragraph is held back until the next line shows whether it is a
+    heading or the start of wrapped prose.
+    
+    Args:
+        filepath (str): Path to the lecture notes file
+        chunk_size (int): Number of characters to read at a time
         
-        # Clean the text
-        cleaned_text = clean_text(text)
-        return cleaned_text
+    Yields:
+        str: Cleaned sentences, in file order
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as file:
+            pending = ""
+            held = None           # First line of a paragraph that may be a heading
+            underline = ""        # Underline read after the held line
+            cue = False           # The held line is marked with '#' or underlined
+            separated = False     # A blank line followed the held line
+            line_start = True
+            paragraph_start = True
+            
+            while True:
+                piece = file.readline(chunk_size)
+                if not piece:
+                    break
+                complete = piece.endswith('\n') or len(piece) < chunk_size
+                
+                # Read the rest of a line while it could still be a heading
+                while line_start and not complete and _may_be_heading(piece):
+                    more = file.readline(chunk_size)
+                    piece += more
+                    complete = not more or more.endswith('\n') or len(more) < chunk_size
+                
+                if line_start and not piece.strip():
+                    paragraph_start = True
+                    separated = held is not None
+                    line_start = complete
+                    continue
+                
+                if held is not None:
+                    if not cue and not separated and complete and _UNDERLINE.match(piece):
+                        underline = piece
+                        cue = True
+                        continue
+                    
+                    if cue or separated:
+                        # Text follows, so the held line was a heading: it
+                        # is dropped and the sentence before it ends
+                        for sentence in _split_pending(pending, True):
+                            yield sentence
+                        pending = ""
+                    else:
+                        # Wrapped prose: the held line is text
+                        pending += held
+                    held = None
+                    underline = ""
+                    cue = separated = False
+                
+                if line_start and paragraph_start and complete:
+                    title, cue = _first_line_heading(piece)
+                    if title is not None:
+                        held = piece
+                if held is None:
+                    pending += piece
+                paragraph_start = False
+                line_start = complete
+                
+                if len(pending) >= chunk_size:
+                    # The last sentence may continue, so it is carried over
+                    sentences = _split_pending(pending, False)
+                    pending = sentences.pop()
+                    for sentence in sentences:
+                        yield sentence
+            
+            # A line held at the end of the file is text, not a heading
+            if held is not None:
+                pending += held + underline
+            for sentence in _split_pending(pending, True):
+                yield sentence
     
     except FileNotFoundError:
         print(f"Error: File '{filepath}' not found!")
-        return ""
     except Exception as e:
         print(f"Error loading file: {e}")
-        return ""
+
+
+def _split_pending(pending, final):
+    """
+    Split pending stream text into cleaned sentences.
+    
+    Unless final, the last item is the raw unfinished rest of the text
+    (possibly "") instead of a sentence.
+    """
+    spans = list(tokenizer.iter_sentences(pending))
+    if final:
+        return [clean_text(pending[start:end]) for start, end in spans]
+    
+    rest = pending[spans[-1][0]:] if spans else pending
+    return [clean_text(pending[start:end]) for start, end in spans[:-1]] + [rest]
+
+
+@register_parser("text", [".txt", ".text"])
+def parse_text(data):
+    """
+    Decode plain UTF-8 text.
+    """
+    return data.decode('utf-8')
+
+
+@register_parser("markdown", [".md", ".markdown"])
+def parse_markdown(data):
+    """
+    Convert Markdown to plain text.
+    
+    Code blocks, images and HTML tags are dropped; links keep their text;
+    headings start sections and list items become separate sentences.
+    """
+    blocks = []
+    in_code = False
+    
+    for line in data.decode('utf-8').splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```") or stripped.startswith("~~~"):
+            in_code = not in_code
+            continue
+        if in_code:
+            continue
+        
+        heading = _MD_HEADING.match(stripped)
+        if heading:
+            blocks.append((HEADING, _md_inline(heading.group(1))))
+            continue
+        
+        item = _MD_LIST_ITEM.match(stripped)
+        if item:
+            blocks.append((TEXT, _end_sentence(_md_inline(item.group(1)))))
+            continue
+        
+        blocks.append((TEXT, _md_inline(stripped.lstrip('> '))))
+    
+    return blocks
+
+
+@register_parser("html", [".html", ".htm"])
+def parse_html(data):
+    """
+    Extract the visible text of an HTML document, split at its headings.
+    """
+    parser = _HTMLTextParser()
+    parser.feed(data.decode('utf-8', errors='replace'))
+    parser.close()
+    return parser.blocks()
+
+
+@register_parser("docx", [".docx"])
+def parse_docx(data):
+    """
+    Extract paragraph text from a DOCX file (word/document.xml).
+    
+    Paragraphs with a heading or title style start sections.
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+    
+    blocks = []
+    for paragraph in root.iter(_DOCX_NS + "p"):
+        text = ''.join(node.text or '' for node in paragraph.iter(_DOCX_NS + "t")).strip()
+        if not text:
+            continue
+        
+        style = paragraph.find(f"{_DOCX_NS}pPr/{_DOCX_NS}pStyle")
+        if style is not None and style.get(_DOCX_NS + "val", "").lower().startswith(("heading", "title")):
+            blocks.append((HEADING, text))
+        else:
+            # Word paragraphs never continue across paragraph marks
+            blocks.append((TEXT, _end_sentence(text)))
+    
+    return blocks
+
+
+@register_parser("pdf_text", [".pdftxt"])
+def parse_pdf_text(data):
+    """
+    Clean text extracted from a PDF (e.g. with pdftotext).
+    
+    Page breaks and bare page numbers are removed and words hyphenated
+    across line ends are joined again.
+    """
+    text = data.decode('utf-8')
+    lines = [line for line in text.replace('\f', '\n').splitlines()
+             if not line.strip().isdigit()]
+    return _PDF_HYPHEN.sub(r'\1\2', '\n'.join(lines))
+
+
+@register_parser("pdf", [".pdf"])
+def parse_pdf(data):
+    """
+    Reject binary PDF files, which need an external text extractor.
+    """
+    raise ValueError("binary PDF is not supported; extract its text first "
+                     "(e.g. pdftotext notes.pdf notes.pdftxt)")
+
+
+_MD_HEADING = re.compile(r'^#{1,6}\s+(.*?)\s*#*$')
+_MD_LIST_ITEM = re.compile(r'^(?:[*+-]|\d+[.)])\s+(.*)$')
+_MD_IMAGE = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+_MD_LINK = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+_MD_MARKUP = re.compile(r'<[^>]+>|[*_`]+')
+_PDF_HYPHEN = re.compile(r'(\w)-\n(\w)')
+_PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n')
+_UNDERLINE = re.compile(r'^\s*(?:={3,}|-{3,})\s*$')
+_DOCX_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def _md_inline(text):
+    """
+    Strip inline Markdown markup from one line.
+    """
+    text = _MD_IMAGE.sub('', text)
+    text = _MD_LINK.sub(r'\1', text)
+    return _MD_MARKUP.sub('', text)
+
+
+def _end_sentence(text):
+    """
+    Make a list item or the end of a section end like a sentence.
+    """
+    text = text.strip()
+    if text and text[-1] not in tokenizer.SENTENCE_TERMINATORS:
+        text += '.'
+    return text
+
+
+class _HTMLTextParser(HTMLParser):
+    """
+    Collect visible text as blocks, ending list items and cells like sentences.
+    """
+    
+    SKIP = frozenset(["script", "style", "head", "title", "noscript", "template"])
+    HEADINGS = frozenset(["h1", "h2", "h3", "h4", "h5", "h6"])
+    BLOCKS = frozenset(["p", "div", "br", "li", "tr", "section", "article",
+                        "blockquote", "pre"]) | HEADINGS
+    SENTENCE_BLOCKS = frozenset(["li", "td", "th"])
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.current = []
+        self.skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self.skip_depth += 1
+        elif tag in self.BLOCKS:
+            self._flush(TEXT)
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIP:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in self.HEADINGS:
+            self._flush(HEADING)
+        elif tag in self.BLOCKS or tag in self.SENTENCE_BLOCKS:
+            self._flush(TEXT, tag in self.SENTENCE_BLOCKS)
+    
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.current.append(data)
+    
+    def blocks(self):
+        self._flush(TEXT)
+        return self.parts
+    
+    def _flush(self, kind, end_sentence=False):
+        text = ' '.join(''.join(self.current).split())
+        self.current = []
+        if text:
+            self.parts.append((kind, _end_sentence(text) if end_sentence else text))
+
+
+def _text_blocks(text):
+    """
+    Split plain text into blocks, detecting headings by their layout.
+    
+    Only the first line of a paragraph can be a heading, and only with a
+    layout cue (see _paragraph_heading): it stands alone between blank
+    lines, starts with '#', or is underlined with '===' or '---'. A
+    heading also needs text after it, so a file never ends in one. Every
+    other line, including the first line of wrapped prose, stays text.
+    """
+    blocks = []
+    paragraphs = [lines for lines in (paragraph.strip().splitlines()
+                                      for paragraph in _PARAGRAPH_BREAK.split(text))
+                  if lines]
+    
+    for i, lines in enumerate(paragraphs):
+        title, rest = _paragraph_heading(lines)
+        
+        # A heading needs text after it, in its paragraph or a later one
+        if title is not None and (rest or i + 1 < len(paragraphs)):
+            blocks.append((HEADING, title))
+            lines = rest
+        
+        if lines:
+            blocks.append((TEXT, '\n'.join(lines)))
+    
+    return blocks
+
+
+def _paragraph_heading(lines):
+    """
+    Find the heading at the start of a plain-text paragraph.
+    
+    Returns:
+        tuple: (title, rest), where rest are the lines after the heading,
+            or (None, lines) if the paragraph does not start with one
+    """
+    title, cue = _first_line_heading(lines[0])
+    if title is None:
+        return None, lines
+    if cue:
+        return title, lines[1:]
+    if len(lines) == 1:
+        return title, []
+    if _UNDERLINE.match(lines[1]):
+        return title, lines[2:]
+    return None, lines
+
+
+def _first_line_heading(line):
+    """
+    Check whether the first line of a paragraph may be a heading.
+    
+    Returns:
+        tuple: (title, cue), where cue is True if a '#' marks the line as
+            a heading, or (None, False) if the line is not heading-like
+    """
+    line = line.strip()
+    marked = _MD_HEADING.match(line)
+    if marked and _is_heading_line(marked.group(1)):
+        return marked.group(1), True
+    if _is_heading_line(line):
+        return line, False
+    return None, False
+
+
+def _is_heading_line(line):
+    """
+    Check whether a plain-text line looks like a heading: a few words with
+    at least one letter or digit, and no sentence terminator or trailing ',;:'.
+    """
+    line = line.strip()
+    return (bool(line) and _may_be_heading(line) and line[-1] not in ",;:"
+            and any(c.isalnum() for c in line))
+
+
+def _may_be_heading(text):
+    """
+    Check whether text (possibly the start of a line) is still short enough
+    and free of sentence terminators to be a heading.
+    """
+    return (len(text.split()) <= MAX_HEADING_WORDS
+            and not any(c in tokenizer.SENTENCE_TERMINATORS for c in text))
 
 
 def clean_text(text):
@@ -57,3 +713,12 @@ if __name__ == "__main__":
     print("Loaded notes:")
     print(notes)
     print(f"\nTotal characters: {len(notes)}")
+    
+    html = b"<html><head><title>x</title></head><body><h1>Loops</h1><p>A loop repeats code.</p></body></html>"
+    print(f"\nHTML: {build_document(parse_html(html))!r}")
+    
+    # Wrapped prose keeps its first line; only stand-alone or marked lines are headings
+    wrapped = "Python is a high-level programming\nlanguage used widely. Variables store data."
+    print(f"Wrapped text: {build_document(_text_blocks(wrapped))!r}")
+    headed = "Loops\n\nA loop repeats code."
+    print(f"Heading: {build_document(_text_blocks(headed))!r}")
@@ -0,0 +1,301 @@
+"""
+Module: instrumentation.py
+Purpose: Optional timing, call/byte counters and profiling for pipeline stages
+
+Instrumentation is off by default. Timers and decorated functions then
+cost one flag check per call; enable() switches collection on for a run.
+"""
+
+import cProfile
+import functools
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+
+# Global switch and collected data of the current run
+_STATE = {
+    "enabled": False,
+    "started": 0.0,
+    "profiler": None,
+    "trace_memory": False
+}
+_METRICS = {}
+
+_NULL_TIMER = nullcontext()
+
+PROFILE_TOP = 20
+
+
+def enable(profile=False, trace_memory=False):
+    """
+    Start collecting metrics for a new run.
+
+    Args:
+        profile (bool): Also run cProfile over the whole run
+        trace_memory (bool): Also track peak memory with tracemalloc
+    """
+    reset()
+    _STATE['enabled'] = True
+    _STATE['started'] = time.perf_counter()
+
+    if trace_memory:
+        tracemalloc.start()
+        _STATE['trace_memory'] = True
+
+    if profile:
+        _STATE['profiler'] = cProfile.Profile()
+        _STATE['profiler'].enable()
+
+
+def disable():
+    """
+    Stop collecting metrics (collected data is kept until reset()).
+    """
+    if _STATE['enabled']:
+        _STATE['seconds'] = time.perf_counter() - _STATE['started']
+    _STATE['enabled'] = False
+
+    if _STATE['profiler'] is not None:
+        _STATE['profiler'].disable()
+
+    if _STATE['trace_memory'] and tracemalloc.is_tracing():
+        _STATE['memory_peak'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+
+def is_enabled():
+    """
+    Check whether metrics are being collected.
+
+    Returns:
+        bool: True while enabled
+    """
+    return _STATE['enabled']
+
+
+def reset():
+    """
+    Drop all collected metrics.
+    """
+    _METRICS.clear()
+    _STATE.update(enabled=False, started=0.0, profiler=None, trace_memory=False)
+    _STATE.pop('memory_peak', None)
+    _STATE.pop('seconds', None)
+
+
+def timer(name, nbytes=0):
+    """
+    Time a block of code under a metric name.
+
+    Usage:
+        with instrumentation.timer("generate", len(text)):
+            ...
+
+    Args:
+        name (str): Metric name
+        nbytes (int): Bytes (or characters) processed by the block
+
+    Returns:
+        context manager: Records one call when enabled, does nothing otherwise
+    """
+    if not _STATE['enabled']:
+        return _NULL_TIMER
+    return _Timer(name, nbytes)
+
+
+def timed(name=None, count_bytes=False):
+    """
+    Decorator that times every call of a function.
+
+    Args:
+        name (str): Metric name (default: module.function)
+        count_bytes (bool): Count the length of the first argument
+            (text or sentence) as bytes processed
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(func):
+        metric = name or f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _STATE['enabled']:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                nbytes = len(args[0]) if count_bytes and args and isinstance(args[0], (str, bytes)) else 0
+                _record(metric, time.perf_counter() - start, nbytes)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name, calls=1, nbytes=0):
+    """
+    Add to the counters of a metric without timing anything.
+
+    Args:
+        name (str): Metric name
+        calls (int): Calls (or items) to add
+        nbytes (int): Bytes to add
+    """
+    if _STATE['enabled']:
+        metric = _get_metric(name)
+        metric['calls'] += calls
+        metric['bytes'] += nbytes
+
+
+def report():
+    """
+    Build the metrics report of the current run.
+
+    Returns:
+        dict: Report with total seconds, per-metric calls, seconds, mean
+            and max seconds, bytes and bytes/sec, plus memory_peak and
+            profile text when those modes were on
+    """
+    seconds = _STATE.get('seconds')
+    if seconds is None:
+        seconds = time.perf_counter() - _STATE['started'] if _STATE['started'] else 0.0
+
+    metrics = {}
+    for name in sorted(_METRICS, key=lambda n: -_METRICS[n]['seconds']):
+        metric = _METRICS[name]
+        metrics[name] = {
+            "calls": metric['calls'],
+            "seconds": round(metric['seconds'], 6),
+            "mean_seconds": round(metric['seconds'] / metric['calls'], 9) if metric['calls'] else 0.0,
+            "max_seconds": round(metric['max_seconds'], 6),
+            "bytes": metric['bytes'],
+            "bytes_per_sec": round(metric['bytes'] / metric['seconds'], 1) if metric['seconds'] > 0 else 0.0
+        }
+
+    data = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seconds": round(seconds, 6),
+        "metrics": metrics
+    }
+
+    if _STATE['trace_memory']:
+        if tracemalloc.is_tracing():
+            data['memory_peak'] = tracemalloc.get_traced_memory()[1]
+        else:
+            data['memory_peak'] = _STATE.get('memory_peak', 0)
+
+    if _STATE['profiler'] is not None:
+        stream = io.StringIO()
+        stats = pstats.Stats(_STATE['profiler'], stream=stream)
+        stats.sort_stats('cumulative').print_stats(PROFILE_TOP)
+        data['profile'] = stream.getvalue()
+
+    return data
+
+
+def format_report(data):
+    """
+    Format a metrics report as a human-readable summary.
+
+    Args:
+        data (dict): Report from report()
+
+    Returns:
+        str: Summary table
+    """
+    lines = [
+        "=" * 78,
+        "PIPELINE METRICS".center(78),
+        "=" * 78,
+        f"{'Metric':<40}{'Calls':>8}{'Seconds':>10}{'Mean ms':>10}{'KB':>10}",
+        "-" * 78
+    ]
+
+    for name, metric in data['metrics'].items():
+        lines.append(f"{name:<40}{metric['calls']:>8}{metric['seconds']:>10.4f}"
+                     f"{metric['mean_seconds'] * 1000:>10.3f}{metric['bytes'] / 1024:>10.1f}")
+
+    lines.append("-" * 78)
+    lines.append(f"Total run time: {data['seconds']:.3f}s")
+    if 'memory_peak' in data:
+        lines.append(f"Peak traced memory: {data['memory_peak'] / 1e6:.2f} MB")
+    if 'profile' in data:
+        lines.append("")
+        lines.append(data['profile'].rstrip())
+    lines.append("=" * 78)
+
+    return '\n'.join(lines)
+
+
+def dump(path):
+    """
+    Write the metrics report of the current run.
+
+    The JSON report goes to path and the human-readable summary next to
+    it (path with a .txt extension).
+
+    Args:
+        path (str): JSON output path
+
+    Returns:
+        str: Human-readable summary
+    """
+    data = report()
+    summary = format_report(data)
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2)
+
+    text_path = path[:-5] + ".txt" if path.endswith(".json") else path + ".txt"
+    with open(text_path, 'w', encoding='utf-8') as file:
+        file.write(summary + "\n")
+
+    return summary
+
+
+class _Timer:
+    """
+    Context manager that records one timed call.
+    """
+
+    __slots__ = ('name', 'nbytes', 'start')
+
+    def __init__(self, name, nbytes):
+        self.name = name
+        self.nbytes = nbytes
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _record(self.name, time.perf_counter() - self.start, self.nbytes)
+
+
+def _get_metric(name):
+    """
+    Get (or create) the counters of a metric.
+    """
+    metric = _METRICS.get(name)
+    if metric is None:
+        metric = _METRICS[name] = {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes": 0}
+    return metric
+
+
+def _record(name, seconds, nbytes):
+    """
+    Record one timed call.
+    """
+    metric = _get_metric(name)
+    metric['calls'] += 1
+    metric['seconds'] += seconds
+    metric['bytes'] += nbytes
+    if seconds > metric['max_seconds']:
+        metric['max_seconds'] = seconds
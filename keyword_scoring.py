@@ -0,0 +1,204 @@
+"""
+Module: keyword_scoring.py
+Purpose: Score sentence keywords with TF-IDF statistics built over a corpus of notes
+"""
+
+import hashlib
+import json
+import math
+
+import instrumentation
+import tokenizer
+
+
+def candidate_terms(text, start=0, end=None):
+    """
+    Get the words of a sentence (or a span of text) that may become keywords.
+
+    Args:
+        text (str): Input sentence or text
+        start (int): Span start offset
+        end (int): Span end offset (default: end of text)
+
+    Returns:
+        list: (word, term) pairs, where term is the lowercase word
+    """
+    pairs = []
+
+    for word_start, word_end in tokenizer.tokenize(text, start, end):
+        word = text[word_start:word_end]
+        if len(word) > 2:
+            term = word.lower()
+            if term not in tokenizer.STOPWORDS:
+                pairs.append((word, term))
+
+    return pairs
+
+
+@instrumentation.timed()
+def build_df_index(documents):
+    """
+    Build document-frequency statistics over a corpus.
+
+    Args:
+        documents (iterable): Cleaned texts, one per lecture file
+
+    Returns:
+        dict: DF index with num_docs, df (term -> number of documents
+            containing it) and digest (content hash, used in cache keys)
+    """
+    df_index = {"num_docs": 0, "df": {}, "digest": ""}
+
+    for text in documents:
+        add_document(df_index, text)
+
+    df_index['digest'] = _digest(df_index)
+    return df_index
+
+
+def add_document(df_index, text):
+    """
+    Add one document to a DF index in place.
+
+    Call refresh_digest() after the last document is added.
+
+    Args:
+        df_index (dict): DF index from build_df_index()
+        text (str): Cleaned document text
+    """
+    df = df_index['df']
+
+    for term in {term for word, term in candidate_terms(text)}:
+        df[term] = df.get(term, 0) + 1
+
+    df_index['num_docs'] += 1
+
+
+def refresh_digest(df_index):
+    """
+    Recompute the content hash of a DF index after it was changed.
+
+    Args:
+        df_index (dict): DF index to update in place
+    """
+    df_index['digest'] = _digest(df_index)
+
+
+@instrumentation.timed()
+def select_keywords(df_index, sentences):
+    """
+    Pick the highest TF-IDF scoring word of every sentence of a document.
+
+    Each sentence is scored as its own document against the corpus
+    statistics: term frequency within the sentence times the smoothed
+    inverse document frequency over the corpus. IDF values are computed
+    once per distinct term for the whole batch. Ties go to the earliest
+    word; a sentence without candidate words falls back to its first word.
+
+    Args:
+        df_index (dict): DF index from build_df_index()
+        sentences (list): Sentences of one document
+
+    Returns:
+        list: Keyword of each sentence
+    """
+    num_docs = df_index['num_docs']
+    df = df_index['df']
+    idf = {}
+
+    keywords = []
+    for sentence in sentences:
+        pairs = candidate_terms(sentence)
+
+        if not pairs:
+            keywords.append(tokenizer.sentence_keyword(sentence))
+            continue
+
+        tf = {}
+        for word, term in pairs:
+            tf[term] = tf.get(term, 0) + 1
+            if term not in idf:
+                idf[term] = math.log((1 + num_docs) / (1 + df.get(term, 0))) + 1
+
+        best_word, best_score = None, 0.0
+        for word, term in pairs:
+            score = tf[term] * idf[term]
+            if score > best_score:
+                best_word, best_score = word, score
+        keywords.append(best_word)
+
+    return keywords
+
+
+def save_df_index(df_index, path):
+    """
+    Save a DF index so later runs can reuse it.
+
+    Terms and counts are stored as two parallel arrays, sorted by term.
+
+    Args:
+        df_index (dict): DF index from build_df_index()
+        path (str): Output file path
+    """
+    terms = sorted(df_index['df'])
+    data = {
+        "num_docs": df_index['num_docs'],
+        "digest": df_index['digest'],
+        "terms": terms,
+        "counts": [df_index['df'][term] for term in terms]
+    }
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, separators=(',', ':'))
+
+
+def load_df_index(path):
+    """
+    Load a DF index saved by save_df_index().
+
+    Args:
+        path (str): Index file path
+
+    Returns:
+        dict: DF index, or None if the file cannot be read
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        print(f"Error: File '{path}' not found!")
+        return None
+    except ValueError as e:
+        print(f"Error reading DF index: {e}")
+        return None
+
+    return {
+        "num_docs": data['num_docs'],
+        "df": dict(zip(data['terms'], data['counts'])),
+        "digest": data['digest']
+    }
+
+
+def _digest(df_index):
+    """
+    Hash the contents of a DF index.
+    """
+    digest = hashlib.sha256(str(df_index['num_docs']).encode('utf-8'))
+    for term in sorted(df_index['df']):
+        digest.update(f"\0{term}\0{df_index['df'][term]}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+# Test function (optional - for module testing)
+if __name__ == "__main__":
+    corpus = [
+        "Python is a programming language. Python uses indentation.",
+        "Java is a programming language. Java runs on the JVM.",
+        "Recursion is a programming technique where a function calls itself."
+    ]
+    df_index = build_df_index(corpus)
+
+    sentences = ["Recursion is a programming technique where a function calls itself",
+                 "Python is a programming language"]
+    for sentence, keyword in zip(sentences, select_keywords(df_index, sentences)):
+        print(f"{keyword:<12} <- {sentence}")
@@ -3,83 +3,171 @@ Module: main.py
 Purpose: Main orchestrator for the Intelligent Quiz Generator & Analyzer
 """
 
+import argparse
+import getpass
+import sqlite3
+
 # Import all modules
+import attempt_store
 import ingest
-import qa_generator
+import instrumentation
 import quiz_engine
+import quiz_pool
 import grader
 import report
 
 
+# Bank size per requested question in adaptive mode
+ADAPTIVE_BANK_FACTOR = 4
+
+DEFAULT_METRICS_PATH = "quiz_metrics.json"
+
+
 def main():
     """
     Main function to run the complete quiz system.
-    """
-    print("\n" + "="*60)
-    print("INTELLIGENT QUIZ GENERATOR & ANALYZER".center(60))
-    print("="*60 + "\n")
     
-    # Step 1: Load lecture notes
-    print("Step 1: Loading lecture notes...")
-    filepath = "data/lecture_notes.txt"
-    notes = ingest.load_notes(filepath)
+    With --metrics, --profile or --trace-memory, every stage is timed and
+    a metrics report is written when the program ends.
+    """
+    parser = argparse.ArgumentParser(description="Run the interactive quiz.")
+    parser.add_argument("--metrics", nargs="?", const=DEFAULT_METRICS_PATH, default=None,
+                        help=f"Write per-stage timings (default file: {DEFAULT_METRICS_PATH})")
+    parser.add_argument("--profile", action="store_true",
+                        help="Also profile the run with cProfile")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also track peak memory with tracemalloc")
+    args = parser.parse_args()
     
-    if not notes:
-        print("Failed to load lecture notes. Exiting.")
+    if not (args.metrics or args.profile or args.trace_memory):
+        run()
         return
     
-    print(f"✓ Loaded {len(notes)} characters from lecture notes.\n")
-    
-    # Step 2: Generate MCQs
-    print("Step 2: Generating quiz questions...")
-    num_questions = 5
-    
-    # Ask user how many questions they want
+    instrumentation.enable(args.profile, args.trace_memory)
     try:
-        user_input = input(f"How many questions do you want? (default: {num_questions}): ").strip()
-        if user_input:
-            num_questions = int(user_input)
-            if num_questions < 1:
-                print("Invalid number. Using default: 5")
-                num_questions = 5
-    except ValueError:
-        print("Invalid input. Using default: 5")
+        run()
+    finally:
+        instrumentation.disable()
+        metrics_path = args.metrics or DEFAULT_METRICS_PATH
+        print(instrumentation.dump(metrics_path))
+        print(f"✓ Metrics written to {metrics_path}")
+
+
+def run():
+    """
+    Run quizzes until the user stops.
+    """
+    while True:
+        print("\n" + "="*60)
+        print("INTELLIGENT QUIZ GENERATOR & ANALYZER".center(60))
+        print("="*60 + "\n")
+        
+        # Step 1: Load lecture notes
+        print("Step 1: Loading lecture notes...")
+        filepath = "data/lecture_notes.txt"
+        with instrumentation.timer("stage.load"):
+            document = ingest.load_document(filepath)
+        notes = document['text']
+        
+        if not notes:
+            print("Failed to load lecture notes. Exiting.")
+            return
+        
+        print(f"✓ Loaded {len(notes)} characters from lecture notes.\n")
+        
+        # Step 2: Generate MCQs
+        print("Step 2: Generating quiz questions...")
         num_questions = 5
-    
-    mcqs = qa_generator.generate_mcqs(notes, num_questions)
-    
-    if not mcqs:
-        print("Failed to generate questions. Exiting.")
-        return
-    
-    print(f"✓ Generated {len(mcqs)} questions.\n")
-    
-    # Wait for user to be ready
-    input("Press Enter to start the quiz...")
-    
-    # Step 3: Run the quiz
-    user_answers = quiz_engine.run_quiz(mcqs)
-    
-    # Step 4: Grade the quiz
-    print("Step 4: Grading your answers...")
-    results = grader.grade_quiz(mcqs, user_answers)
-    print("✓ Grading completed.\n")
-    
-    # Step 5: Generate and display report
-    print("Step 5: Generating performance report...")
-    report_data = report.generate_report(results, mcqs, user_answers)
-    report.print_report(report_data)
-    
-    # Ask if user wants to retry
-    print("\n" + "="*60)
-    retry = input("Would you like to take another quiz? (yes/no): ").strip().lower()
-    
-    if retry in ['yes', 'y']:
-        print("\n" * 2)
-        main()  # Recursive call to restart
-    else:
+        
+        # Ask user how many questions they want
+        try:
+            user_input = input(f"How many questions do you want? (default: {num_questions}): ").strip()
+            if user_input:
+                num_questions = int(user_input)
+                if num_questions < 1:
+                    print("Invalid number. Using default: 5")
+                    num_questions = 5
+        except ValueError:
+            print("Invalid input. Using default: 5")
+            num_questions = 5
+        
+        # Adaptive mode draws from a larger bank, focusing on weak topics
+        adaptive = input("Adaptive mode (focus on weak topics)? (yes/no, default: no): ").strip().lower()
+        adaptive = adaptive in ['yes', 'y']
+        
+        bank_size = num_questions * ADAPTIVE_BANK_FACTOR if adaptive else num_questions
+        # Quizzes come from a pool that is refilled in the background,
+        # so retries start without waiting for generation
+        with instrumentation.timer("stage.generate", len(notes)):
+            mcqs = quiz_pool.get_pool(notes, bank_size,
+                                      sections=document['sections']).get()
+        
+        if not mcqs:
+            print("Failed to generate questions. Exiting.")
+            return
+        
+        print(f"✓ Generated {len(mcqs)} questions.\n")
+        
+        # Wait for user to be ready
+        input("Press Enter to start the quiz...")
+        
+        # Step 3: Run the quiz
+        latencies = {}
+        with instrumentation.timer("stage.quiz"):
+            if adaptive:
+                mcqs, user_answers, _ = quiz_engine.run_adaptive_quiz(
+                    mcqs, num_questions, latencies)
+            else:
+                user_answers = quiz_engine.run_quiz(mcqs, latencies)
+        
+        # Step 4: Grade the quiz
+        print("Step 4: Grading your answers...")
+        with instrumentation.timer("stage.grade"):
+            results = grader.grade_quiz(mcqs, user_answers)
+        print("✓ Grading completed.\n")
+        
+        # Keep the attempt so weak topics can be tracked across quizzes
+        with instrumentation.timer("stage.save_attempts"):
+            save_attempts(results, latencies)
+        
+        # Step 5: Generate and display report
+        print("Step 5: Generating performance report...")
+        with instrumentation.timer("stage.report"):
+            report_data = report.generate_report(results, mcqs, user_answers)
+            report.print_report(report_data)
+        
+        # Ask if user wants to retry
+        print("\n" + "="*60)
+        retry = input("Would you like to take another quiz? (yes/no): ").strip().lower()
+        
+        if retry in ['yes', 'y']:
+            print("\n" * 2)
+            continue  # Restart without growing the call stack
+        
+        quiz_pool.close_pools()
         print("\nThank you for using the Quiz Generator!")
         print("="*60 + "\n")
+        break
+
+
+def save_attempts(results, latencies):
+    """
+    Add the graded answers to the local attempt history.
+    
+    Args:
+        results (dict): Grading results from grader.py
+        latencies (dict): Seconds taken per question number
+    """
+    try:
+        student = getpass.getuser()
+    except (KeyError, OSError):
+        student = "student"
+    
+    try:
+        with attempt_store.AttemptStore() as store:
+            store.add_results(student, results, latencies)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Warning: could not save attempt history: {e}")
 
 
 # Entry point
@@ -0,0 +1,141 @@
+"""
+Module: mcq.py
+Purpose: Compact in-memory representation of a multiple choice question
+"""
+
+import sys
+
+
+class MCQ:
+    """
+    A multiple choice question stored in a fixed set of slots.
+
+    Options are kept as a tuple of interned strings and the answer as an
+    index into it, so large banks share repeated option text instead of
+    holding one dict per question. Item access (mcq['answer'],
+    mcq.get('keyword')) is supported so code written for MCQ dictionaries
+    keeps working; use to_dict() only when writing JSON or other output.
+    """
+
+    __slots__ = ('question', 'options', 'answer_index', 'keyword', 'section')
+
+    FIELDS = ('question', 'options', 'answer', 'keyword', 'section')
+
+    def __init__(self, question, options, answer_index, keyword="", section=""):
+        self.question = question
+        self.options = tuple(sys.intern(option) for option in options)
+        self.answer_index = answer_index
+        self.keyword = sys.intern(keyword)
+        self.section = sys.intern(section)
+
+    @property
+    def answer(self):
+        """
+        str: Text of the correct option.
+        """
+        return self.options[self.answer_index]
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create an MCQ from an MCQ dictionary.
+
+        Args:
+            data (dict): Dictionary with question, options, answer, keyword
+                and (optionally) section
+
+        Returns:
+            MCQ: Compact question
+        """
+        options = list(data['options'])
+        answer = data['answer']
+
+        # Keep the answer reachable even if it is missing from the options
+        if answer not in options:
+            options.append(answer)
+
+        return cls(data['question'], options, options.index(answer),
+                   data.get('keyword', ''), data.get('section', ''))
+
+    def to_dict(self):
+        """
+        Convert to an MCQ dictionary (for JSON and other output formats).
+
+        Returns:
+            dict: Dictionary with question, options, answer, keyword and
+                section (only when the question has one)
+        """
+        data = {
+            "question": self.question,
+            "options": list(self.options),
+            "answer": self.answer,
+            "keyword": self.keyword
+        }
+        if self.section:
+            data['section'] = self.section
+        return data
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.FIELDS:
+            return default
+        return getattr(self, key)
+
+    def __eq__(self, other):
+        if not isinstance(other, MCQ):
+            return NotImplemented
+        return (self.question == other.question
+                and self.options == other.options
+                and self.answer_index == other.answer_index
+                and self.keyword == other.keyword
+                and self.section == other.section)
+
+    def __hash__(self):
+        return hash((self.question, self.options, self.answer_index, self.keyword,
+                     self.section))
+
+    def __repr__(self):
+        return f"MCQ(question={self.question!r}, answer={self.answer!r})"
+
+
+def from_dicts(items):
+    """
+    Convert MCQ dictionaries (or MCQs) into MCQ objects.
+
+    Args:
+        items (list): List of MCQ dictionaries or MCQ objects
+
+    Returns:
+        list: List of MCQ objects
+    """
+    return [item if isinstance(item, MCQ) else MCQ.from_dict(item) for item in items]
+
+
+def to_dicts(mcqs):
+    """
+    Convert MCQ objects (or dictionaries) into MCQ dictionaries.
+
+    Args:
+        mcqs (list): List of MCQ objects or MCQ dictionaries
+
+    Returns:
+        list: List of MCQ dictionaries
+    """
+    return [mcq.to_dict() if isinstance(mcq, MCQ) else mcq for mcq in mcqs]
+
+
+# Test function (optional - for module testing)
+if __name__ == "__main__":
+    question = MCQ("What is Python?",
+                   ["A snake", "A programming language", "A framework", "A database"],
+                   1, "Python")
+
+    print(question)
+    print(f"Answer: {question['answer']}")
+    print(f"Round trip: {MCQ.from_dict(question.to_dict()) == question}")
+    print(f"Size: {sys.getsizeof(question)} bytes "
+          f"(dict: {sys.getsizeof(question.to_dict())} bytes)")
@@ -4,79 +4,355 @@ Purpose: Generate MCQs from lecture notes using pure Python logic
 """
 
 import random
+import string
 
+import instrumentation
+import keyword_scoring
+import similarity
+import tokenizer
+from mcq import MCQ
 
-def generate_mcqs(text, num_questions=5):
+
+# Static distractor pool
+STATIC_DISTRACTORS = [
+    "A type of database",
+    "A web framework",
+    "A hardware component",
+    "An operating system",
+    "A network protocol",
+    "A file format",
+    "A design pattern",
+    "A testing methodology",
+    "A version control system",
+    "A programming paradigm"
+]
+
+# Question template registry, filled by register_template()
+QUESTION_TEMPLATES = []
+_TEMPLATE_CUM_WEIGHTS = []
+
+# Fields a question template may use
+TEMPLATE_FIELDS = frozenset(["keyword", "sentence", "blank"])
+
+
+def generate_mcqs(text, num_questions=5, seed=None, rng=None, df_index=None,
+                  sections=None):
     """
     Generate multiple choice questions from text.
     
     Args:
-        text (str): Lecture notes text
+        text (str or iterable): Lecture notes text, or an iterable of
+            sentences such as ingest.stream_sentences()
         num_questions (int): Number of questions to generate
+        seed (int): Seed for a private random generator (optional)
+        rng (random.Random): Random generator to use instead of a seed (optional)
+        df_index (dict): Corpus statistics from keyword_scoring.build_df_index();
+            when given, keywords are chosen by TF-IDF (text input only)
+        sections (list): Section character ranges from ingest.build_document();
+            questions are then tagged with their section (text input only)
         
     Returns:
-        list: List of MCQ dictionaries
+        list: List of MCQ objects
     """
-    # Split text into sentences
-    sentences = split_into_sentences(text)
+    # Each request draws from its own generator, so identical text,
+    # parameters and seed always produce identical output
+    rng = get_rng(seed, rng)
+    
+    # Sentence streams (e.g. ingest.stream_sentences) are consumed lazily
+    if not isinstance(text, str):
+        return generate_mcqs_from_stream(text, num_questions, rng=rng)
+    
+    # Split text into sentences and index their keywords in one pass
+    sentences, index = split_and_index(text, df_index, sections)
     
     if len(sentences) == 0:
         print("Error: No sentences found in text!")
         return []
     
-    # Limit number of questions to available sentences
-    num_questions = min(num_questions, len(sentences))
+    return generate_mcqs_from_index(sentences, index, num_questions, rng=rng)
+
+
+@instrumentation.timed()
+def generate_mcqs_from_index(sentences, index, num_questions=5, seed=None, rng=None,
+                             section=None):
+    """
+    Generate multiple choice questions from pre-split sentences and their index.
+    
+    Args:
+        sentences (list): List of sentences
+        index (dict): Keyword index from build_keyword_index()
+        num_questions (int): Number of questions to generate
+        seed (int): Seed for a private random generator (optional)
+        rng (random.Random): Random generator to use instead of a seed (optional)
+        section (str): Only ask about sentences of the sections with this
+            title (needs an index built with sections, see split_and_index())
+        
+    Returns:
+        list: List of MCQ objects
+    """
+    rng = get_rng(seed, rng)
+    
+    if section is None:
+        # Limit number of questions to available sentences
+        num_questions = min(num_questions, len(sentences))
+        
+        # Select random sentences for questions
+        selected_sentences = rng.sample(sentences, num_questions)
+    else:
+        selected_sentences = [sentences[i] for i in
+                              sample_section(index, section, num_questions, rng)]
     
-    # Select random sentences for questions
-    selected_sentences = random.sample(sentences, num_questions)
+    return _create_mcqs(selected_sentences, index, rng)
+
+
+def generate_mcqs_by_section(sentences, index, per_section=1, seed=None, rng=None):
+    """
+    Generate questions covering every section of a document.
     
-    mcqs = []
-    for i, sentence in enumerate(selected_sentences):
-        # Extract keyword from sentence
+    Args:
+        sentences (list): List of sentences
+        index (dict): Keyword index built with sections (see split_and_index())
+        per_section (int): Questions to sample from each section
+        seed (int): Seed for a private random generator (optional)
+        rng (random.Random): Random generator to use instead of a seed (optional)
+        
+    Returns:
+        list: List of MCQ objects, in section order
+    """
+    rng = get_rng(seed, rng)
+    
+    positions = []
+    for entry in index.get('sections', []):
+        start, end = entry['start'], entry['end']
+        positions.extend(rng.sample(range(start, end), min(per_section, end - start)))
+    
+    return _create_mcqs([sentences[i] for i in positions], index, rng)
+
+
+def sample_section(index, title, k, rng=None):
+    """
+    Sample sentence positions from the sections with a given title.
+    
+    Sections are stored as sentence ranges, so sampling only draws k
+    positions; no sentence is scanned or copied.
+    
+    Args:
+        index (dict): Keyword index built with sections (see split_and_index())
+        title (str): Section title ("" for text before the first heading)
+        k (int): Number of positions
+        rng (random.Random): Random generator (default: the random module)
+        
+    Returns:
+        list: Up to k distinct positions in the sentence list
+    """
+    if rng is None:
+        rng = random
+    
+    ranges = [(entry['start'], entry['end']) for entry in index.get('sections', [])
+              if entry['title'] == title]
+    total = sum(end - start for start, end in ranges)
+    
+    positions = []
+    for offset in rng.sample(range(total), min(k, total)):
+        # Map the offset into the concatenated ranges of the title
+        for start, end in ranges:
+            if offset < end - start:
+                positions.append(start + offset)
+                break
+            offset -= end - start
+    
+    return positions
+
+
+def create_mcq(sentence, index, rng=None, similar=None):
+    """
+    Create one multiple choice question for an indexed sentence.
+    
+    Args:
+        sentence (str): Sentence to ask about (must be in the index)
+        index (dict): Keyword index from build_keyword_index()
+        rng (random.Random): Random generator (default: the random module)
+        similar (list): Keywords nearest to the answer, if already looked up
+        
+    Returns:
+        MCQ: Generated question, or None if the sentence has no keyword
+    """
+    if rng is None:
+        rng = random
+    
+    # Look up the keyword computed when the index was built
+    keyword = index['sentence_keywords'][sentence]
+    
+    if not keyword:
+        return None
+    
+    # Create question
+    question = create_question(sentence, keyword, rng)
+    
+    # Generate options (1 correct + 3 distractors)
+    correct_answer = keyword
+    distractors = create_distractors(keyword, None, sentence, index, rng, similar)
+    
+    # Combine and shuffle options
+    options = [correct_answer] + distractors
+    rng.shuffle(options)
+    
+    # Create compact MCQ, tagged with the section the sentence came from
+    section = index.get('sentence_sections', {}).get(sentence, "")
+    return MCQ(question, options, options.index(correct_answer), keyword, section)
+
+
+def generate_mcqs_from_stream(sentences, num_questions=5, seed=None, rng=None):
+    """
+    Generate multiple choice questions from a stream of sentences.
+    
+    Only the sentences chosen for questions (reservoir sampling) and the
+    distractor pool are kept, so memory does not grow with the input size.
+    
+    Args:
+        sentences (iterable): Iterable of sentences
+        num_questions (int): Number of questions to generate
+        seed (int): Seed for a private random generator (optional)
+        rng (random.Random): Random generator to use instead of a seed (optional)
+        
+    Returns:
+        list: List of MCQ objects
+    """
+    rng = get_rng(seed, rng)
+    
+    selected_sentences = []
+    keywords = set()
+    distractor_pool = []
+    seen_count = 0
+    
+    for sentence in sentences:
+        seen_count += 1
+        
+        # Every keyword can serve as a distractor for any question
         keyword = extract_keyword(sentence)
+        if keyword and keyword.lower() not in keywords:
+            keywords.add(keyword.lower())
+            distractor_pool.append(keyword)
         
-        if keyword:
-            # Create question
-            question = create_question(sentence, keyword)
-            
-            # Generate options (1 correct + 3 distractors)
-            correct_answer = keyword
-            distractors = create_distractors(keyword, sentences, sentence)
-            
-            # Combine and shuffle options
-            options = [correct_answer] + distractors
-            random.shuffle(options)
-            
-            # Create MCQ dictionary
-            mcq = {
-                "question": question,
-                "options": options,
-                "answer": correct_answer,
-                "keyword": keyword
-            }
-            
-            mcqs.append(mcq)
+        # Reservoir sampling keeps a uniform sample of the stream
+        if len(selected_sentences) < num_questions:
+            selected_sentences.append(sentence)
+        else:
+            j = rng.randrange(seen_count)
+            if j < num_questions:
+                selected_sentences[j] = sentence
     
-    return mcqs
+    if seen_count == 0:
+        print("Error: No sentences found in text!")
+        return []
+    
+    _add_static_distractors(keywords, distractor_pool)
+    
+    # Index only the sampled sentences, but share the full distractor pool
+    index = build_keyword_index(selected_sentences)
+    index['keywords'] = keywords
+    index['distractor_pool'] = distractor_pool
+    index.pop('ngram_index', None)
+    
+    return generate_mcqs_from_index(selected_sentences, index, num_questions, rng=rng)
+
+
+def get_rng(seed=None, rng=None):
+    """
+    Get the random generator for one generation request.
+    
+    Args:
+        seed (int): Seed for a new generator (optional)
+        rng (random.Random): Existing generator, returned as is (optional)
+        
+    Returns:
+        random.Random: An rng private to the request
+    """
+    if rng is not None:
+        return rng
+    
+    return random.Random(seed)
 
 
+@instrumentation.timed(count_bytes=True)
 def split_into_sentences(text):
     """
     Split text into sentences.
     
+    Sentences end at '.', '!' or '?', except after abbreviations such as
+    "e.g." and inside numbers such as 3.14 (see tokenizer.iter_sentences).
+    
     Args:
         text (str): Input text
         
     Returns:
         list: List of sentences
     """
-    # Split by period
-    sentences = text.split('.')
+    return [text[start:end] for start, end in tokenizer.iter_sentences(text)]
+
+
+@instrumentation.timed(count_bytes=True)
+def split_and_index(text, df_index=None, sections=None):
+    """
+    Split text into sentences and build their keyword index in one pass.
+    
+    The text is scanned once for sentence boundaries and each sentence's
+    keyword is picked as soon as it is cut out. With a DF index, keywords
+    are instead scored by TF-IDF in one batch over all sentences.
+    
+    With sections, each sentence is assigned to the section its start
+    falls in during the same scan, and the index also gets:
+        sections (list): {"title", "start", "end"} per section, where
+            start:end is the range of its sentences in the sentence list
+        sentence_sections (dict): sentence -> section title
+    
+    Args:
+        text (str): Input text
+        df_index (dict): Corpus statistics from keyword_scoring (optional)
+        sections (list): Section character ranges from
+            ingest.build_document() (optional)
+        
+    Returns:
+        tuple: (sentences, index) as from split_into_sentences() and
+            build_keyword_index()
+    """
+    sentences = []
+    keywords = [] if df_index is None else None
     
-    # Clean and filter empty sentences
-    sentences = [s.strip() for s in sentences if s.strip()]
+    ranges = []
+    sentence_sections = {}
+    pending = iter(sections or ())
+    current = next(pending, None)
+    opened = None
     
-    return sentences
+    for start, end in tokenizer.iter_sentences(text):
+        sentence = text[start:end]
+        
+        # Sections are sorted, so the current one only ever moves forward
+        while current is not None and start >= current['end']:
+            current = next(pending, None)
+        if current is not None and start >= current['start']:
+            if current is not opened:
+                opened = current
+                ranges.append({"title": current['title'], "start": len(sentences),
+                               "end": len(sentences)})
+            ranges[-1]['end'] += 1
+            sentence_sections.setdefault(sentence, current['title'])
+        
+        sentences.append(sentence)
+        if keywords is not None:
+            keywords.append(tokenizer.sentence_keyword(text, start, end))
+    
+    if df_index is not None:
+        keywords = keyword_scoring.select_keywords(df_index, sentences)
+    
+    index = build_keyword_index(sentences, keywords)
+    
+    if sections is not None:
+        index['sections'] = ranges
+        index['sentence_sections'] = sentence_sections
+    
+    return sentences, index
 
 
 def extract_keyword(sentence):
@@ -87,113 +363,346 @@ def extract_keyword(sentence):
         sentence (str): Input sentence
         
     Returns:
-        str: Extracted keyword
+        str: Extracted keyword (first meaningful word, or the first word)
     """
-    # Common words to skip
-    common_words = ['is', 'are', 'was', 'were', 'the', 'a', 'an', 'and', 'or', 
-                   'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by']
+    return tokenizer.sentence_keyword(sentence)
+
+
+@instrumentation.timed()
+def build_keyword_index(sentences, keywords=None):
+    """
+    Build a reusable keyword index for a document.
+    
+    The index is built in one pass so that question generation never has
+    to call extract_keyword() again for the rest of the document.
+    
+    Args:
+        sentences (list): List of sentences
+        keywords (list): Keyword of each sentence, if already known (optional)
+        
+    Returns:
+        dict: Index with the following keys:
+            sentence_keywords (dict): sentence -> keyword
+            keyword_sentences (dict): keyword -> list of sentences
+            keywords (set): Deduplicated lowercase keywords
+            keyword_counts (dict): Lowercase keyword -> number of sentences
+            distractor_pool (list): Unique keywords (first spelling seen)
+                followed by the static distractors, deduplicated case-insensitively
+    """
+    index = {
+        "sentence_keywords": {},
+        "keyword_sentences": {},
+        "keywords": set(),
+        "keyword_counts": {},
+        "distractor_pool": []
+    }
+    
+    for i, sentence in enumerate(sentences):
+        add_to_index(index, sentence, None if keywords is None else keywords[i])
+    
+    # Static distractors go after the document keywords, as before
+    _add_static_distractors(index['keywords'], index['distractor_pool'])
+    
+    return index
+
+
+def add_to_index(index, sentence, keyword=None):
+    """
+    Add one sentence to a keyword index in place.
+    
+    Args:
+        index (dict): Keyword index from build_keyword_index()
+        sentence (str): Sentence to add (ignored if already indexed)
+        keyword (str): Keyword of the sentence, if already known (optional)
+    """
+    if sentence in index['sentence_keywords']:
+        return
+    
+    if keyword is None:
+        keyword = extract_keyword(sentence)
+    index['sentence_keywords'][sentence] = keyword
+    
+    if not keyword:
+        return
+    
+    index['keyword_sentences'].setdefault(keyword, []).append(sentence)
+    
+    lower = keyword.lower()
+    index['keyword_counts'][lower] = index['keyword_counts'].get(lower, 0) + 1
+    
+    if lower not in index['keywords']:
+        index['keywords'].add(lower)
+        index['distractor_pool'].append(keyword)
+        index.pop('ngram_index', None)
+
+
+def remove_from_index(index, sentence):
+    """
+    Remove one sentence from a keyword index in place.
+    
+    Keywords that no longer occur in any sentence also leave the keyword
+    set and the distractor pool.
     
-    # Split sentence into words
-    words = sentence.split()
+    Args:
+        index (dict): Keyword index from build_keyword_index()
+        sentence (str): Sentence to remove (ignored if not indexed)
+    """
+    keyword = index['sentence_keywords'].pop(sentence, None)
+    
+    if not keyword:
+        return
+    
+    keyword_sentences = index['keyword_sentences']
+    keyword_sentences[keyword].remove(sentence)
+    if not keyword_sentences[keyword]:
+        del keyword_sentences[keyword]
     
-    # Find first meaningful word (capitalized or not in common words)
-    for word in words:
-        # Remove punctuation
-        clean_word = word.strip('.,!?;:')
+    lower = keyword.lower()
+    index['keyword_counts'][lower] -= 1
+    if index['keyword_counts'][lower] == 0:
+        del index['keyword_counts'][lower]
+        index['keywords'].discard(lower)
         
-        # Check if it's a meaningful keyword
-        if clean_word and clean_word.lower() not in common_words and len(clean_word) > 2:
-            return clean_word
+        pool = index['distractor_pool']
+        for i, d in enumerate(pool):
+            if d.lower() == lower:
+                del pool[i]
+                break
+        index.pop('ngram_index', None)
+
+
+def index_to_json(index):
+    """
+    Convert a keyword index to JSON-serializable data.
     
-    # If no keyword found, return first word
-    if words:
-        return words[0].strip('.,!?;:')
+    Args:
+        index (dict): Keyword index from build_keyword_index()
+        
+    Returns:
+        dict: Index with the keyword set stored as a sorted list (the
+            n-gram index is left out and rebuilt on demand)
+    """
+    data = dict(index)
+    data['keywords'] = sorted(index['keywords'])
+    data.pop('ngram_index', None)
+    return data
+
+
+def index_from_json(data):
+    """
+    Convert data from index_to_json() back into a keyword index.
     
-    return ""
+    Args:
+        data (dict): JSON data of an index
+        
+    Returns:
+        dict: Keyword index
+    """
+    index = dict(data)
+    index['keywords'] = set(data['keywords'])
+    return index
 
 
-def create_question(sentence, keyword):
+@instrumentation.timed()
+def get_ngram_index(index):
+    """
+    Get the n-gram index over the document keywords of a keyword index.
+    
+    The n-gram index is built on first use and kept in the keyword index;
+    add_to_index() and remove_from_index() drop it when the keyword set
+    changes. Static distractors are not part of it.
+    
+    Args:
+        index (dict): Keyword index from build_keyword_index()
+        
+    Returns:
+        dict: N-gram index from similarity.build_ngram_index()
+    """
+    ngram_index = index.get('ngram_index')
+    
+    if ngram_index is None:
+        keywords = index['keywords']
+        ngram_index = similarity.build_ngram_index(
+            [d for d in index['distractor_pool'] if d.lower() in keywords])
+        index['ngram_index'] = ngram_index
+    
+    return ngram_index
+
+
+def _create_mcqs(selected_sentences, index, rng):
+    """
+    Create the questions for selected sentences, in order.
+    """
+    # Look up the nearest keywords for the whole bank in one batch
+    sentence_keywords = index['sentence_keywords']
+    neighbours = similarity.nearest_keywords_batch(
+        get_ngram_index(index),
+        [sentence_keywords[s] for s in selected_sentences])
+    
+    mcqs = []
+    for sentence, similar in zip(selected_sentences, neighbours):
+        mcq = create_mcq(sentence, index, rng, similar)
+        
+        if mcq is not None:
+            mcqs.append(mcq)
+    
+    return mcqs
+
+
+def _add_static_distractors(keywords, distractor_pool):
+    """
+    Append the static distractors that do not clash with a document keyword.
+    
+    Args:
+        keywords (set): Lowercase document keywords
+        distractor_pool (list): Pool to extend in place
+    """
+    seen = set(keywords)
+    for d in STATIC_DISTRACTORS:
+        if d.lower() not in seen:
+            seen.add(d.lower())
+            distractor_pool.append(d)
+
+
+def register_template(template, weight=1):
+    """
+    Register a question template.
+    
+    The template is parsed once here; rendering only fills in the fields
+    it actually uses, so unused templates cost nothing per question.
+    
+    Args:
+        template (str): Format string using {keyword}, {sentence} and/or
+            {blank} (the sentence with the keyword blanked out); fields
+            are substituted verbatim, without format specs or conversions
+        weight (float): Relative probability of choosing this template
+    
+    Raises:
+        ValueError: If the weight is not positive, a field is unknown or a
+            field has a format spec ("{keyword:>10}") or conversion ("{keyword!r}")
+    """
+    if weight <= 0:
+        raise ValueError(f"Template weight must be positive, got {weight}")
+    
+    # Compile into (literal, field) pairs
+    parts = []
+    for literal, field, format_spec, conversion in string.Formatter().parse(template):
+        if field is not None and field not in TEMPLATE_FIELDS:
+            raise ValueError(f"Unknown template field '{{{field}}}' in: {template}")
+        if format_spec or conversion:
+            raise ValueError(f"Format specs and conversions are not supported "
+                             f"in template field '{{{field}}}' in: {template}")
+        parts.append((literal, field))
+    
+    total = _TEMPLATE_CUM_WEIGHTS[-1] if _TEMPLATE_CUM_WEIGHTS else 0
+    QUESTION_TEMPLATES.append({
+        "template": template,
+        "weight": weight,
+        "parts": parts,
+        "fields": frozenset(field for literal, field in parts if field)
+    })
+    _TEMPLATE_CUM_WEIGHTS.append(total + weight)
+
+
+def render_template(entry, sentence, keyword):
+    """
+    Render a registered template for one sentence and keyword.
+    
+    Args:
+        entry (dict): Template entry from QUESTION_TEMPLATES
+        sentence (str): Original sentence
+        keyword (str): Keyword to ask about
+        
+    Returns:
+        str: Rendered question
+    """
+    values = {"keyword": keyword, "sentence": sentence}
+    
+    # Only build the blanked sentence when the template needs it
+    if "blank" in entry['fields']:
+        values["blank"] = sentence.replace(keyword, '_____')
+    
+    return ''.join(literal + (values[field] if field else '')
+                   for literal, field in entry['parts'])
+
+
+# Default question templates
+register_template("What is {keyword}?")
+register_template("Which of the following describes {keyword}?")
+register_template("Fill in the blank: {blank}")
+register_template("According to the notes, what is true about {keyword}?")
+
+
+@instrumentation.timed()
+def create_question(sentence, keyword, rng=None):
     """
     Create a question from a sentence and keyword.
     
     Args:
         sentence (str): Original sentence
         keyword (str): Keyword to ask about
+        rng (random.Random): Random generator (default: the random module)
         
     Returns:
         str: Generated question
     """
-    # Question templates
-    templates = [
-        f"What is {keyword}?",
-        f"Which of the following describes {keyword}?",
-        f"Fill in the blank: {sentence.replace(keyword, '_____')}",
-        f"According to the notes, what is true about {keyword}?"
-    ]
-    
-    # Choose random template
-    question = random.choice(templates)
+    # Choose a weighted random template, then render only that one
+    if rng is None:
+        rng = random
+    entry = rng.choices(QUESTION_TEMPLATES, cum_weights=_TEMPLATE_CUM_WEIGHTS)[0]
+    question = render_template(entry, sentence, keyword)
     
     return question
 
 
-def create_distractors(keyword, all_sentences, current_sentence):
+@instrumentation.timed()
+def create_distractors(keyword, all_sentences, current_sentence, index=None, rng=None,
+                       similar=None):
     """
     Create distractor (wrong) options.
     
+    The keywords most similar to the answer (by character n-grams) come
+    first, so wrong options look plausible; random keywords from the pool
+    fill in when the document has too few similar ones.
+    
     Args:
         keyword (str): Correct answer keyword
         all_sentences (list): All sentences from text
         current_sentence (str): Current sentence being used
+        index (dict): Keyword index from build_keyword_index() (optional,
+            built from all_sentences when not given)
+        rng (random.Random): Random generator (default: the random module)
+        similar (list): Keywords nearest to the answer, if already looked
+            up with similarity.nearest_keywords_batch() (optional)
         
     Returns:
         list: List of 3 distractor options
     """
-    # Static distractor pool
-    static_distractors = [
-        "A type of database",
-        "A web framework",
-        "A hardware component",
-        "An operating system",
-        "A network protocol",
-        "A file format",
-        "A design pattern",
-        "A testing methodology",
-        "A version control system",
-        "A programming paradigm"
-    ]
-    
-    # Extract keywords from other sentences
-    other_keywords = []
-    for sentence in all_sentences:
-        if sentence != current_sentence:
-            kw = extract_keyword(sentence)
-            if kw and kw != keyword:
-                other_keywords.append(kw)
-    
-    # Combine keyword-based and static distractors
-    distractor_pool = other_keywords + static_distractors
-    
-    # Remove duplicates and the correct keyword
-    distractor_pool = [d for d in distractor_pool if d.lower() != keyword.lower()]
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_distractors = []
-    for d in distractor_pool:
-        if d.lower() not in seen:
-            seen.add(d.lower())
-            unique_distractors.append(d)
+    if index is None:
+        index = build_keyword_index(all_sentences)
+    if rng is None:
+        rng = random
+    if similar is None:
+        similar = similarity.nearest_keywords(get_ngram_index(index), keyword)
     
-    # Select 3 random distractors
-    if len(unique_distractors) >= 3:
-        distractors = random.sample(unique_distractors, 3)
-    else:
-        # If not enough unique distractors, use what we have and add generic ones
-        distractors = unique_distractors + static_distractors
-        distractors = random.sample(distractors, min(3, len(distractors)))
+    distractors = list(similar[:3])
+    if len(distractors) == 3:
+        return distractors
+    
+    # The pool is already unique (case-insensitive), so only the correct
+    # keyword and the similar ones have to be skipped. Sampling that many
+    # extra items keeps the cost independent of document size.
+    taken = {d.lower() for d in distractors}
+    taken.add(keyword.lower())
+    distractor_pool = index['distractor_pool']
+    sample_size = min(3 + len(taken), len(distractor_pool))
+    for d in rng.sample(distractor_pool, sample_size):
+        if len(distractors) == 3:
+            break
+        if d.lower() not in taken:
+            distractors.append(d)
     
-    return distractors[:3]
+    return distractors
 
 
 # Test function (optional - for module testing)
@@ -3,13 +3,26 @@ Module: quiz_engine.py
 Purpose: Display questions in terminal and collect user answers
 """
 
+import time
+from collections import OrderedDict, deque
 
-def run_quiz(mcqs):
+
+# Mastery estimates are grouped into this many buckets, so the weakest
+# keyword is found by checking a fixed number of buckets
+MASTERY_BUCKETS = 10
+
+# A keyword stops being asked once its mastery estimate is this certain
+# (standard deviation of the Beta estimate)
+CONFIDENT_SD = 0.15
+
+
+def run_quiz(mcqs, latencies=None):
     """
     Run the quiz in terminal and collect user answers.
     
     Args:
-        mcqs (list): List of MCQ dictionaries
+        mcqs (list): List of MCQs (objects or dictionaries)
+        latencies (dict): Filled with seconds taken per question number (optional)
         
     Returns:
         dict: Dictionary mapping question numbers to user answers
@@ -28,7 +41,10 @@ def run_quiz(mcqs):
         display_question(mcq, i)
         
         # Get user answer
+        start = time.perf_counter()
         answer = get_user_answer(mcq['options'])
+        if latencies is not None:
+            latencies[i] = round(time.perf_counter() - start, 3)
         
         # Store user's selected answer text
         user_answers[i] = answer
@@ -47,7 +63,7 @@ def display_question(question_data, question_num):
     Display a single question with options.
     
     Args:
-        question_data (dict): MCQ data containing question and options
+        question_data (MCQ or dict): MCQ data containing question and options
         question_num (int): Question number
     """
     print(f"Question {question_num}: {question_data['question']}")
@@ -91,6 +107,204 @@ def get_user_answer(options):
             exit()
 
 
+def build_keyword_questions(mcqs):
+    """
+    Index the questions of a bank by keyword.
+    
+    Args:
+        mcqs (list): List of MCQs (objects or dictionaries)
+        
+    Returns:
+        dict: Keyword -> deque of question positions, in bank order
+    """
+    keyword_questions = {}
+    
+    for i, mcq in enumerate(mcqs):
+        keyword = mcq.get('keyword', '')
+        if keyword:
+            keyword_questions.setdefault(keyword, deque()).append(i)
+    
+    return keyword_questions
+
+
+def new_adaptive_state(mcqs, prior=(1, 1), confident_sd=CONFIDENT_SD):
+    """
+    Create the state of an adaptive quiz for one student.
+    
+    Mastery of each keyword is a Beta(correct + a, wrong + b) estimate,
+    starting from the prior (a, b). Keywords are kept in buckets by their
+    estimated mastery, so the weakest keyword with questions left is
+    found without looking at every keyword. Buckets are OrderedDicts:
+    their front stays O(1) to reach however many keywords have left it,
+    which a plain dict does not guarantee.
+    
+    Args:
+        mcqs (list): Question bank (objects or dictionaries)
+        prior (tuple): Beta prior (a, b) for an unseen keyword
+        confident_sd (float): Stop asking about a keyword once the
+            standard deviation of its estimate falls below this
+        
+    Returns:
+        dict: Adaptive quiz state
+    """
+    keyword_questions = build_keyword_questions(mcqs)
+    buckets = [OrderedDict() for _ in range(MASTERY_BUCKETS)]
+    
+    a, b = prior
+    start = _bucket(a / (a + b))
+    for keyword in keyword_questions:
+        buckets[start][keyword] = None
+    
+    return {
+        "mcqs": mcqs,
+        "keyword_questions": keyword_questions,
+        "mastery": {keyword: [a, b] for keyword in keyword_questions},
+        "buckets": buckets,
+        "bucket_of": dict.fromkeys(keyword_questions, start),
+        "confident_sd": confident_sd,
+        "asked": 0
+    }
+
+
+def next_question(state):
+    """
+    Pick the next question, targeting the weakest keyword.
+    
+    Takes the keyword from the lowest non-empty mastery bucket (keywords
+    within a bucket take turns) and its next unasked question.
+    
+    Args:
+        state (dict): State from new_adaptive_state()
+        
+    Returns:
+        int: Position of the question in the bank, or None when every
+            keyword is either confident or out of questions
+    """
+    for bucket in state['buckets']:
+        if bucket:
+            keyword = next(iter(bucket))
+            return state['keyword_questions'][keyword].popleft()
+    
+    return None
+
+
+def record_answer(state, position, is_correct):
+    """
+    Update the mastery estimate of a question's keyword.
+    
+    Args:
+        state (dict): State from new_adaptive_state()
+        position (int): Position of the answered question in the bank
+        is_correct (bool): Whether the answer was correct
+    """
+    state['asked'] += 1
+    keyword = state['mcqs'][position].get('keyword', '')
+    if keyword not in state['mastery']:
+        return
+    
+    counts = state['mastery'][keyword]
+    counts[0 if is_correct else 1] += 1
+    a, b = counts
+    
+    # Keywords already retired (confident or out of questions) stay out
+    if keyword not in state['bucket_of']:
+        return
+    
+    old = state['bucket_of'][keyword]
+    total = a + b
+    variance = a * b / (total * total * (total + 1))
+    if variance < state['confident_sd'] ** 2 or not state['keyword_questions'][keyword]:
+        del state['buckets'][old][keyword]
+        del state['bucket_of'][keyword]
+        return
+    
+    # Move the keyword to the back of its (possibly new) bucket
+    bucket = _bucket(a / total)
+    if bucket == old:
+        state['buckets'][bucket].move_to_end(keyword)
+    else:
+        del state['buckets'][old][keyword]
+        state['buckets'][bucket][keyword] = None
+        state['bucket_of'][keyword] = bucket
+
+
+def get_mastery(state):
+    """
+    Get the current mastery estimates.
+    
+    Args:
+        state (dict): State from new_adaptive_state()
+        
+    Returns:
+        dict: Keyword -> estimated probability of answering correctly
+    """
+    return {keyword: round(a / (a + b), 3)
+            for keyword, (a, b) in state['mastery'].items()}
+
+
+def run_adaptive_quiz(mcqs, max_questions=None, latencies=None):
+    """
+    Run an adaptive quiz in terminal.
+    
+    Questions are picked one at a time from the bank, each time for the
+    keyword with the lowest estimated mastery, until max_questions were
+    asked or every keyword's estimate is confident.
+    
+    Args:
+        mcqs (list): Question bank (objects or dictionaries)
+        max_questions (int): Maximum number of questions (default: no limit)
+        latencies (dict): Filled with seconds taken per question number (optional)
+        
+    Returns:
+        tuple: (asked, user_answers, mastery) where asked lists the MCQs in
+            the order they were asked, user_answers maps question numbers
+            to answers (as from run_quiz()) and mastery is get_mastery()
+    """
+    state = new_adaptive_state(mcqs)
+    asked = []
+    user_answers = {}
+    
+    print("\n" + "="*60)
+    print("ADAPTIVE QUIZ STARTED".center(60))
+    print("="*60)
+    print("\nQuestions focus on the topics you find hardest.")
+    print("Enter the option number (1-4) for each question.")
+    print("-"*60 + "\n")
+    
+    while max_questions is None or len(asked) < max_questions:
+        position = next_question(state)
+        if position is None:
+            break
+        
+        mcq = mcqs[position]
+        question_num = len(asked) + 1
+        display_question(mcq, question_num)
+        
+        start = time.perf_counter()
+        answer = get_user_answer(mcq['options'])
+        if latencies is not None:
+            latencies[question_num] = round(time.perf_counter() - start, 3)
+        
+        asked.append(mcq)
+        user_answers[question_num] = answer
+        record_answer(state, position, answer == mcq['answer'])
+        
+        print()  # Blank line between questions
+    
+    print("="*60)
+    print("QUIZ COMPLETED".center(60))
+    print("="*60 + "\n")
+    
+    return asked, user_answers, get_mastery(state)
+
+
+def _bucket(mastery):
+    """
+    Map a mastery estimate in [0, 1] to its bucket.
+    """
+    return min(int(mastery * MASTERY_BUCKETS), MASTERY_BUCKETS - 1)
+
+
 # Test function (optional - for module testing)
 if __name__ == "__main__":
     # Test MCQs
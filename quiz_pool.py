@@ -0,0 +1,209 @@
+"""
+Module: quiz_pool.py
+Purpose: Keep ready-made quizzes per set of notes, refilled by a background thread
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+import qa_generator
+
+
+DEFAULT_HIGH_WATER = 4
+
+# Pools created by get_pool(), keyed by notes text, quiz length and sections
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+class QuizPool:
+    """
+    Pool of pre-generated quizzes for one set of notes.
+
+    The notes are split and indexed once. A daemon thread keeps the pool
+    topped up to the high-water mark; get() pops a ready quiz in O(1),
+    and only generates one on the spot when the pool is empty.
+    """
+
+    def __init__(self, notes, num_questions=5, high_water=DEFAULT_HIGH_WATER,
+                 seed=None, start=True, sections=None):
+        """
+        Create a quiz pool.
+
+        Args:
+            notes (str): Cleaned lecture notes text
+            num_questions (int): Questions per quiz
+            high_water (int): Number of ready quizzes to keep
+            seed (int): Seed for reproducible quiz sequences (optional)
+            start (bool): Start the refill thread right away
+            sections (list): Section ranges from ingest.build_document(),
+                to tag questions with their section (optional)
+        """
+        self.num_questions = num_questions
+        self.high_water = high_water
+        self.sentences, self.index = qa_generator.split_and_index(notes, sections=sections)
+
+        # Build the shared lookup structures before threads read the index
+        qa_generator.get_ngram_index(self.index)
+
+        self._ready = deque()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self._thread = None
+
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "refills": 0,
+            "refill_seconds": 0.0,
+            "max_refill_seconds": 0.0
+        }
+
+        if start:
+            self.start()
+
+    def start(self):
+        """
+        Start the background refill thread (if not already running).
+        """
+        with self._lock:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(target=self._refill_loop,
+                                            name="quiz-pool-refill", daemon=True)
+        self._thread.start()
+
+    def get(self):
+        """
+        Get a quiz, from the pool when one is ready.
+
+        Returns:
+            list: List of MCQ objects
+        """
+        with self._lock:
+            if self._ready:
+                self._stats['hits'] += 1
+                mcqs = self._ready.popleft()
+                self._wakeup.notify()
+                return mcqs
+            self._stats['misses'] += 1
+            self._wakeup.notify()
+
+        # Pool is empty: generate this one while the caller waits
+        return self._generate()
+
+    def stats(self):
+        """
+        Get the pool counters.
+
+        Returns:
+            dict: hits, misses, hit_rate, refills, mean/max refill seconds
+                and the number of ready quizzes
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['ready'] = len(self._ready)
+
+        requests = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / requests * 100, 2) if requests else 0.0
+        stats['mean_refill_seconds'] = (stats['refill_seconds'] / stats['refills']
+                                        if stats['refills'] else 0.0)
+        return stats
+
+    def close(self):
+        """
+        Stop the refill thread.
+        """
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _generate(self):
+        """
+        Generate one quiz with its own random generator.
+        """
+        with self._lock:
+            seed = self._rng.getrandbits(64)
+        return qa_generator.generate_mcqs_from_index(self.sentences, self.index,
+                                                     self.num_questions, seed)
+
+    def _refill_loop(self):
+        """
+        Keep the pool at the high-water mark until closed.
+        """
+        while True:
+            with self._lock:
+                while not self._closed and len(self._ready) >= self.high_water:
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+
+            start = time.perf_counter()
+            mcqs = self._generate()
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self._ready.append(mcqs)
+                self._stats['refills'] += 1
+                self._stats['refill_seconds'] += elapsed
+                if elapsed > self._stats['max_refill_seconds']:
+                    self._stats['max_refill_seconds'] = elapsed
+
+
+def get_pool(notes, num_questions=5, high_water=DEFAULT_HIGH_WATER, sections=None):
+    """
+    Get the shared pool for a set of notes and quiz length, creating it once.
+
+    Args:
+        notes (str): Cleaned lecture notes text
+        num_questions (int): Questions per quiz
+        high_water (int): Number of ready quizzes to keep (new pools only)
+        sections (list): Section ranges from ingest.build_document() (optional)
+
+    Returns:
+        QuizPool: Running pool
+    """
+    key = (notes, num_questions,
+           tuple((s['title'], s['start'], s['end']) for s in sections or ()))
+
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = QuizPool(notes, num_questions, high_water,
+                                          sections=sections)
+
+    return pool
+
+
+def close_pools():
+    """
+    Stop and forget every pool created by get_pool().
+    """
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+
+    for pool in pools:
+        pool.close()
+
+
+# Test function (optional - for module testing)
+if __name__ == "__main__":
+    import ingest
+
+    document = ingest.load_document("data/lecture_notes.txt")
+    pool = QuizPool(document['text'], num_questions=3, sections=document['sections'])
+
+    for _ in range(3):
+        quiz = pool.get()
+        print(f"Got quiz: {[q['keyword'] for q in quiz]}")
+        time.sleep(0.05)
+
+    pool.close()
+    print(pool.stats())
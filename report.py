@@ -3,6 +3,20 @@ Module: report.py
 Purpose: Generate and display performance report
 """
 
+import csv
+import html
+import io
+import json
+import math
+import os
+import string
+import sys
+import zipfile
+
+
+# Letter grades in display order, as returned by get_grade()
+GRADES = ["A (Excellent)", "B (Good)", "C (Average)", "D (Below Average)", "F (Fail)"]
+
 
 def generate_report(results, mcqs, user_answers):
     """
@@ -23,6 +37,7 @@ def generate_report(results, mcqs, user_answers):
     report_data = {
         "results": results,
         "weak_topics": weak_topics,
+        "weak_sections": group_weak_topics_by_section(results),
         "grade": get_grade(results['percentage'])
     }
     
@@ -40,16 +55,46 @@ def identify_weak_topics(results):
         list: List of weak topics/keywords
     """
     weak_topics = []
+    seen = set()
     
     for detail in results['details']:
         if not detail['is_correct']:
             keyword = detail.get('keyword', '')
-            if keyword and keyword not in weak_topics:
+            if keyword and keyword not in seen:
+                seen.add(keyword)
                 weak_topics.append(keyword)
     
     return weak_topics
 
 
+def group_weak_topics_by_section(results):
+    """
+    Group the weak topics by the notes section their questions came from.
+    
+    Sections are read from the grading details (tagged when the questions
+    were generated), so the notes are never scanned again.
+    
+    Args:
+        results (dict): Grading results
+        
+    Returns:
+        dict: Section title -> list of weak keywords, in question order
+            ("" holds questions without a section)
+    """
+    weak_sections = {}
+    seen = set()
+    
+    for detail in results['details']:
+        if not detail['is_correct']:
+            keyword = detail.get('keyword', '')
+            section = detail.get('section', '')
+            if keyword and (section, keyword) not in seen:
+                seen.add((section, keyword))
+                weak_sections.setdefault(section, []).append(keyword)
+    
+    return weak_sections
+
+
 def get_grade(percentage):
     """
     Convert percentage to letter grade.
@@ -76,67 +121,528 @@ def print_report(report_data):
     """
     Print formatted report to terminal.
     
+    The report is rendered into one string and written with a single call.
+    
+    Args:
+        report_data (dict): Report data from generate_report()
+    """
+    sys.stdout.write(render_report(report_data))
+
+
+def render_report(report_data, report_format="text"):
+    """
+    Render a report into one string, without printing it.
+    
+    Args:
+        report_data (dict): Report data from generate_report()
+        report_format (str): "text" (as printed by print_report), "json",
+            "csv" (one row per question) or "html" (self-contained page)
+        
+    Returns:
+        str: Rendered report
+    """
+    return _get_renderer(report_format)(report_data)
+
+
+def save_report(report_data, path, report_format=None):
+    """
+    Render a report and write it to a file in one write.
+    
     Args:
         report_data (dict): Report data from generate_report()
+        path (str): Output file
+        report_format (str): Format (default: from the file extension,
+            see REPORT_EXTENSIONS)
+    """
+    if report_format is None:
+        report_format = _format_for_path(path)
+    
+    content = render_report(report_data, report_format)
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        file.write(content)
+
+
+def render_reports(named_reports, report_format="csv"):
+    """
+    Render many reports into one document.
+    
+    CSV output has a single header and a leading name column; JSON output
+    has one report per line (JSON Lines).
+    
+    Args:
+        named_reports (iterable): (name, report data) pairs, e.g. student
+            ids with generate_report() output
+        report_format (str): "csv" or "json"
+        
+    Returns:
+        str: Combined document
+    """
+    if report_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(("name",) + CSV_COLUMNS)
+        for name, report_data in named_reports:
+            writer.writerows((name,) + row for row in _csv_rows(report_data))
+        return buffer.getvalue()
+    
+    if report_format == "json":
+        return ''.join(json.dumps({"name": name, "report": report_data}, ensure_ascii=False) + '\n'
+                       for name, report_data in named_reports)
+    
+    raise ValueError(f"Reports cannot be combined as '{report_format}' (use csv or json)")
+
+
+def archive_reports(named_reports, path, report_format="html", compresslevel=6):
+    """
+    Render many reports into one ZIP archive, one member per report.
+    
+    Reports are rendered and compressed one at a time into a buffered
+    file, so memory does not grow with the number of reports.
+    
+    Args:
+        named_reports (iterable): (name, report data) pairs; names become
+            member file names and must be unique
+        path (str): Output .zip file
+        report_format (str): Format of every member
+        compresslevel (int): Deflate level (1 = fastest, 9 = smallest)
+        
+    Returns:
+        int: Number of reports written
+    """
+    renderer = _get_renderer(report_format)
+    extension = REPORT_EXTENSIONS[report_format]
+    count = 0
+    
+    with open(path, 'wb', buffering=ARCHIVE_BUFFER_BYTES) as file, \
+            zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as archive:
+        for name, report_data in named_reports:
+            archive.writestr(f"{name}{extension}", renderer(report_data))
+            count += 1
+    
+    return count
+
+
+# Columns of the CSV format, one row per question
+CSV_COLUMNS = ("question_num", "question", "user_answer", "correct_answer",
+               "is_correct", "keyword", "section")
+
+# Report format -> file extension
+REPORT_EXTENSIONS = {
+    "text": ".txt",
+    "json": ".json",
+    "csv": ".csv",
+    "html": ".html"
+}
+
+ARCHIVE_BUFFER_BYTES = 1024 * 1024
+
+_RULE = "-" * 60
+_DOUBLE_RULE = "=" * 60
+
+# Templates are built once at import; rendering only substitutes values
+_TEXT_REPORT = string.Template(
+    "\n" + _DOUBLE_RULE + "\n"
+    + "QUIZ PERFORMANCE REPORT".center(60) + "\n"
+    + _DOUBLE_RULE + "\n\n"
+    "OVERALL SCORE:\n" + _RULE + "\n"
+    "Total Questions:    $total\n"
+    "Correct Answers:    $correct\n"
+    "Wrong Answers:      $wrong\n"
+    "Percentage Score:   $percentage%\n"
+    "Grade:              $grade\n"
+    + _RULE + "\n\n"
+    "DETAILED BREAKDOWN:\n" + _RULE + "$details\n\n"
+    + _RULE + "\n\n"
+    "AREAS FOR IMPROVEMENT:\n" + _RULE + "\n"
+    "$weak_topics\n\n"
+    + _RULE + "\n\n"
+    "PERFORMANCE SUMMARY:\n" + _RULE + "\n"
+    "$message\n\n"
+    + _DOUBLE_RULE + "\n\n"
+)
+_TEXT_CORRECT = string.Template(
+    "\n\nQuestion $question_num: ✓ CORRECT\n"
+    "Q: $question\n"
+    "Your answer:    $user_answer")
+_TEXT_WRONG = string.Template(
+    "\n\nQuestion $question_num: ✗ WRONG\n"
+    "Q: $question\n"
+    "Your answer:    $user_answer\n"
+    "Correct answer: $correct_answer")
+_TEXT_REVIEW = "You need to review the following topics:\n\n"
+_TEXT_NO_WEAK_TOPICS = "Excellent! No weak areas identified."
+
+_HTML_REPORT = string.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Quiz Performance Report</title>
+<style>
+body{font-family:system-ui,sans-serif;max-width:48rem;margin:2rem auto;color:#222}
+table{border-collapse:collapse;width:100%}
+th,td{border-bottom:1px solid #ddd;padding:.4rem .6rem;text-align:left}
+tr.correct td:first-child{border-left:4px solid #2e7d32}
+tr.wrong td:first-child{border-left:4px solid #c62828}
+.score{font-size:1.25rem}
+</style>
+</head>
+<body>
+<h1>Quiz Performance Report</h1>
+<p class="score">$correct / $total correct ($percentage%) &middot; Grade: $grade</p>
+<h2>Detailed Breakdown</h2>
+<table>
+<tr><th>#</th><th>Question</th><th>Your answer</th><th>Correct answer</th></tr>
+$rows
+</table>
+<h2>Areas for Improvement</h2>
+$weak_topics
+<h2>Performance Summary</h2>
+<p>$message</p>
+</body>
+</html>
+""")
+_HTML_ROW = string.Template(
+    '<tr class="$status"><td>$question_num</td><td>$question</td>'
+    '<td>$user_answer</td><td>$correct_answer</td></tr>')
+
+
+def _render_text(report_data):
+    """
+    Render a report as the terminal text of print_report().
     """
     results = report_data['results']
     weak_topics = report_data['weak_topics']
-    grade = report_data['grade']
+    weak_sections = report_data.get('weak_sections', {})
     
-    print("\n" + "="*60)
-    print("QUIZ PERFORMANCE REPORT".center(60))
-    print("="*60 + "\n")
+    details = ''.join(
+        (_TEXT_CORRECT if detail['is_correct'] else _TEXT_WRONG).substitute(detail)
+        for detail in results['details'])
     
-    # Overall Score
-    print("OVERALL SCORE:")
-    print("-" * 60)
-    print(f"Total Questions:    {results['total']}")
-    print(f"Correct Answers:    {results['correct']}")
-    print(f"Wrong Answers:      {results['wrong']}")
-    print(f"Percentage Score:   {results['percentage']}%")
-    print(f"Grade:              {grade}")
-    print("-" * 60 + "\n")
+    if weak_topics and any(weak_sections):
+        lines = []
+        for section, topics in weak_sections.items():
+            lines.append(f"  {section or 'Other'}:")
+            lines.extend(f"    {i}. {topic}" for i, topic in enumerate(topics, 1))
+        weak_text = _TEXT_REVIEW + '\n'.join(lines)
+    elif weak_topics:
+        weak_text = _TEXT_REVIEW + '\n'.join(
+            f"  {i}. {topic}" for i, topic in enumerate(weak_topics, 1))
+    else:
+        weak_text = _TEXT_NO_WEAK_TOPICS
     
-    # Question-by-Question Breakdown
-    print("DETAILED BREAKDOWN:")
-    print("-" * 60)
+    return _TEXT_REPORT.substitute(
+        total=results['total'],
+        correct=results['correct'],
+        wrong=results['wrong'],
+        percentage=results['percentage'],
+        grade=report_data['grade'],
+        details=details,
+        weak_topics=weak_text,
+        message=_summary_message(results['percentage']))
+
+
+def _render_json(report_data):
+    """
+    Render a report as a JSON document.
+    """
+    return json.dumps(report_data, ensure_ascii=False)
+
+
+def _render_csv(report_data):
+    """
+    Render the per-question results of a report as CSV.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(CSV_COLUMNS)
+    writer.writerows(_csv_rows(report_data))
+    return buffer.getvalue()
+
+
+def _csv_rows(report_data):
+    """
+    Get the CSV rows of a report.
+    """
+    return [(detail['question_num'], detail['question'], detail['user_answer'],
+             detail['correct_answer'], int(detail['is_correct']),
+             detail.get('keyword', ''), detail.get('section', ''))
+            for detail in report_data['results']['details']]
+
+
+def _render_html(report_data):
+    """
+    Render a report as a self-contained HTML page (inline CSS, no scripts).
+    """
+    results = report_data['results']
+    escape = html.escape
+    
+    rows = '\n'.join(
+        _HTML_ROW.substitute(
+            status="correct" if detail['is_correct'] else "wrong",
+            question_num=detail['question_num'],
+            question=escape(detail['question']),
+            user_answer=escape(detail['user_answer']),
+            correct_answer=escape(detail['correct_answer']))
+        for detail in results['details'])
+    
+    weak_sections = report_data.get('weak_sections', {})
+    if report_data['weak_topics'] and any(weak_sections):
+        weak_html = ''.join(
+            f"<h3>{escape(section or 'Other')}</h3><ol>"
+            + ''.join(f"<li>{escape(topic)}</li>" for topic in topics) + "</ol>"
+            for section, topics in weak_sections.items())
+    elif report_data['weak_topics']:
+        weak_html = "<ol>" + ''.join(f"<li>{escape(topic)}</li>"
+                                     for topic in report_data['weak_topics']) + "</ol>"
+    else:
+        weak_html = f"<p>{_TEXT_NO_WEAK_TOPICS}</p>"
+    
+    return _HTML_REPORT.substitute(
+        total=results['total'],
+        correct=results['correct'],
+        percentage=results['percentage'],
+        grade=escape(report_data['grade']),
+        rows=rows,
+        weak_topics=weak_html,
+        message=_summary_message(results['percentage']))
+
+
+def _summary_message(percentage):
+    """
+    Get the closing message for a percentage score.
+    """
+    if percentage >= 80:
+        return "Outstanding performance! Keep up the great work!"
+    elif percentage >= 60:
+        return "Good effort! Review weak topics and try again."
+    else:
+        return "Need improvement. Please review the topics and retry."
+
+
+def _get_renderer(report_format):
+    """
+    Look up the renderer of a report format.
+    """
+    renderer = RENDERERS.get(report_format)
+    if renderer is None:
+        raise ValueError(f"Unknown report format '{report_format}' "
+                         f"(expected one of: {', '.join(RENDERERS)})")
+    return renderer
+
+
+def _format_for_path(path):
+    """
+    Pick the report format from a file extension.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for report_format, format_extension in REPORT_EXTENSIONS.items():
+        if extension == format_extension:
+            return report_format
+    raise ValueError(f"Cannot tell the report format of '{path}' "
+                     f"(use one of: {', '.join(REPORT_EXTENSIONS.values())})")
+
+
+# Report format -> renderer, used by render_report()
+RENDERERS = {
+    "text": _render_text,
+    "json": _render_json,
+    "csv": _render_csv,
+    "html": _render_html
+}
+
+
+def new_cohort_stats():
+    """
+    Create empty running statistics for a cohort report.
+    
+    Returns:
+        dict: Counters updated by add_to_cohort()
+    """
+    return {
+        "students": 0,
+        "score_sum": 0,
+        "score_sq_sum": 0,
+        "percentage_sum": 0.0,
+        "grades": dict.fromkeys(GRADES, 0),
+        "keywords": {},
+        "questions": {}
+    }
+
+
+def add_to_cohort(stats, results):
+    """
+    Add one student's graded results to the running cohort statistics.
+    
+    Only counters and sums are kept, so memory depends on the number of
+    distinct questions and keywords, never on the number of students.
+    
+    Args:
+        stats (dict): Statistics from new_cohort_stats(), updated in place
+        results (dict): Grading results from grader.py
+    """
+    score = results['correct']
+    
+    stats['students'] += 1
+    stats['score_sum'] += score
+    stats['score_sq_sum'] += score * score
+    stats['percentage_sum'] += results['percentage']
+    stats['grades'][get_grade(results['percentage'])] += 1
+    
+    keywords = stats['keywords']
+    questions = stats['questions']
     
     for detail in results['details']:
-        status = "✓ CORRECT" if detail['is_correct'] else "✗ WRONG"
-        print(f"\nQuestion {detail['question_num']}: {status}")
-        print(f"Q: {detail['question']}")
-        print(f"Your answer:    {detail['user_answer']}")
+        correct = 1 if detail['is_correct'] else 0
         
-        if not detail['is_correct']:
-            print(f"Correct answer: {detail['correct_answer']}")
+        keyword = detail.get('keyword', '')
+        if keyword:
+            counts = keywords.get(keyword)
+            if counts is None:
+                counts = keywords[keyword] = [0, 0]
+            counts[0] += 1
+            counts[1] += 1 - correct
+        
+        # Per question: attempts, correct answers, and the summed total
+        # score of the students who got it right (for discrimination)
+        question = questions.get(detail['question'])
+        if question is None:
+            question = questions[detail['question']] = [detail['question_num'], 0, 0, 0, 0]
+        question[1] += 1
+        question[2] += correct
+        question[3] += score * correct
+        question[4] += score
+
+
+def generate_cohort_report(results_stream, stats=None):
+    """
+    Generate an aggregated report over many students in one pass.
     
-    print("\n" + "-" * 60 + "\n")
+    Args:
+        results_stream (iterable): Grading results from grader.py, one per
+            student (a list, generator or other stream)
+        stats (dict): Running statistics to continue from (optional)
+        
+    Returns:
+        dict: Cohort report with students, mean_score, mean_percentage,
+            grade distribution, keyword error rates (highest first) and
+            per-question difficulty and discrimination
+    """
+    if stats is None:
+        stats = new_cohort_stats()
     
-    # Weak Topics
-    print("AREAS FOR IMPROVEMENT:")
-    print("-" * 60)
+    for results in results_stream:
+        add_to_cohort(stats, results)
     
-    if weak_topics:
-        print("You need to review the following topics:\n")
-        for i, topic in enumerate(weak_topics, 1):
-            print(f"  {i}. {topic}")
-    else:
-        print("Excellent! No weak areas identified.")
+    return summarize_cohort(stats)
+
+
+def summarize_cohort(stats):
+    """
+    Turn running cohort statistics into a report.
     
-    print("\n" + "-" * 60 + "\n")
+    Difficulty is the share of students answering a question correctly.
+    Discrimination is the point-biserial correlation between answering
+    the question correctly and the student's total score, computed from
+    the running sums; it is 0.0 when everyone (or no one) got the
+    question right.
     
-    # Performance Summary
-    print("PERFORMANCE SUMMARY:")
+    Args:
+        stats (dict): Statistics from new_cohort_stats() / add_to_cohort()
+        
+    Returns:
+        dict: Cohort report (see generate_cohort_report())
+    """
+    students = stats['students']
+    
+    keywords = [{
+        "keyword": keyword,
+        "attempts": attempts,
+        "wrong": wrong,
+        "error_rate": round(wrong / attempts * 100, 2)
+    } for keyword, (attempts, wrong) in stats['keywords'].items()]
+    keywords.sort(key=lambda k: (-k['error_rate'], -k['attempts'], k['keyword']))
+    
+    questions = []
+    for question, (num, attempts, correct, correct_score, total_score) in stats['questions'].items():
+        questions.append({
+            "question_num": num,
+            "question": question,
+            "attempts": attempts,
+            "difficulty": round(correct / attempts, 4),
+            "discrimination": round(_point_biserial(stats, attempts, correct,
+                                                    correct_score, total_score), 4)
+        })
+    questions.sort(key=lambda q: q['question_num'])
+    
+    return {
+        "students": students,
+        "mean_score": round(stats['score_sum'] / students, 2) if students else 0.0,
+        "mean_percentage": round(stats['percentage_sum'] / students, 2) if students else 0.0,
+        "grades": dict(stats['grades']),
+        "keywords": keywords,
+        "questions": questions
+    }
+
+
+def _point_biserial(stats, attempts, correct, correct_score, total_score):
+    """
+    Point-biserial correlation of one question with the total score.
+    
+    Uses the score spread of the whole cohort, so students who did not
+    see the question only affect the standard deviation.
+    """
+    students = stats['students']
+    if students < 2 or correct == 0 or correct == attempts:
+        return 0.0
+    
+    mean = stats['score_sum'] / students
+    variance = stats['score_sq_sum'] / students - mean * mean
+    if variance <= 0:
+        return 0.0
+    
+    p = correct / attempts
+    mean_correct = correct_score / correct
+    mean_wrong = (total_score - correct_score) / (attempts - correct)
+    
+    return (mean_correct - mean_wrong) / math.sqrt(variance) * math.sqrt(p * (1 - p))
+
+
+def print_cohort_report(cohort_report, limit=10):
+    """
+    Print a cohort report to the terminal.
+    
+    Args:
+        cohort_report (dict): Report from generate_cohort_report()
+        limit (int): Number of weakest keywords to show
+    """
+    print("\n" + "="*60)
+    print("COHORT PERFORMANCE REPORT".center(60))
+    print("="*60 + "\n")
+    
+    print(f"Students:           {cohort_report['students']}")
+    print(f"Mean Score:         {cohort_report['mean_score']}")
+    print(f"Mean Percentage:    {cohort_report['mean_percentage']}%")
+    print("-" * 60 + "\n")
+    
+    print("GRADE DISTRIBUTION:")
     print("-" * 60)
+    for grade, count in cohort_report['grades'].items():
+        print(f"{grade:<20}{count:>6}")
+    print("-" * 60 + "\n")
     
-    if results['percentage'] >= 80:
-        message = "Outstanding performance! Keep up the great work!"
-    elif results['percentage'] >= 60:
-        message = "Good effort! Review weak topics and try again."
-    else:
-        message = "Need improvement. Please review the topics and retry."
+    print("WEAKEST KEYWORDS:")
+    print("-" * 60)
+    for row in cohort_report['keywords'][:limit]:
+        print(f"{row['keyword']:<30}{row['wrong']:>8}/{row['attempts']:<8}"
+              f"{row['error_rate']:>8.2f}%")
+    print("-" * 60 + "\n")
     
-    print(message)
+    print("QUESTIONS:")
+    print("-" * 60)
+    print(f"{'#':<5}{'Attempts':>10}{'Difficulty':>12}{'Discrimination':>16}")
+    for q in cohort_report['questions']:
+        print(f"{q['question_num']:<5}{q['attempts']:>10}{q['difficulty']:>12.2f}"
+              f"{q['discrimination']:>16.2f}")
     
     print("\n" + "="*60 + "\n")
 
@@ -0,0 +1,500 @@
+"""
+Module: server.py
+Purpose: Serve quizzes over HTTP to many concurrent students (asyncio, stdlib only)
+
+Endpoints (JSON in, JSON out):
+    POST   /sessions                       Generate a quiz, returns session_id
+    GET    /sessions/<id>/questions/<n>    Fetch question n (1-based)
+    POST   /sessions/<id>/answers          Submit {"question_num", "choice" or "answer"}
+    GET    /sessions/<id>/grade            Grade the quiz (once) and return the report
+    DELETE /sessions/<id>                  End the session
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import bank_format
+import grader
+import grading_service
+import ingest
+import qa_generator
+import report
+
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_QUESTIONS = 100
+SESSION_TTL = 60 * 60
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error"
+}
+
+
+class HTTPError(Exception):
+    """
+    Error that is sent back to the client with an HTTP status code.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def create_app(notes, bank=None, sections=None):
+    """
+    Create the application state for a set of lecture notes.
+
+    The notes are split and indexed once; each new session only pays for
+    sampling its own questions.
+
+    Args:
+        notes (str): Cleaned lecture notes text
+        bank (bank_format.BankFile): Prebuilt question bank; when given,
+            sessions draw their questions from it instead (optional)
+        sections (list): Section ranges from ingest.build_document() (optional)
+
+    Returns:
+        dict: Application state (sentences, index, bank, grading service,
+            sessions)
+    """
+    sentences, index = qa_generator.split_and_index(notes, sections=sections)
+
+    app = {
+        "sentences": sentences,
+        "index": index,
+        "bank": bank,
+        "grading": None,
+        "sessions": {}
+    }
+
+    return app
+
+
+def generate_quiz(app, body):
+    """
+    Generate the questions for a new session.
+
+    Args:
+        app (dict): Application state
+        body (dict): Request body with optional num_questions, seed and text
+
+    Returns:
+        list: List of MCQ objects
+    """
+    num_questions = _get_int(body, "num_questions", 5)
+    if not 1 <= num_questions <= MAX_QUESTIONS:
+        raise HTTPError(400, f"num_questions must be between 1 and {MAX_QUESTIONS}")
+
+    seed = _get_seed(body)
+
+    if body.get("text"):
+        # Custom notes are split and indexed for this session only
+        mcqs = qa_generator.generate_mcqs(ingest.clean_text(str(body["text"])),
+                                          num_questions, seed)
+    elif app['bank'] is not None:
+        # Only the sampled questions are decoded from the mapped bank
+        bank = app['bank']
+        rng = qa_generator.get_rng(seed)
+        mcqs = [bank[n] for n in rng.sample(range(len(bank)), min(num_questions, len(bank)))]
+    else:
+        mcqs = qa_generator.generate_mcqs_from_index(app['sentences'], app['index'],
+                                                     num_questions, seed)
+
+    if not mcqs:
+        raise HTTPError(400, "No questions could be generated")
+
+    return mcqs
+
+
+def create_session(app, mcqs):
+    """
+    Register a new session for generated questions.
+
+    Args:
+        app (dict): Application state
+        mcqs (list): Questions of the session
+
+    Returns:
+        dict: Session id and number of questions
+    """
+    session_id = uuid.uuid4().hex
+    app['sessions'][session_id] = {
+        "mcqs": mcqs,
+        "answers": {},
+        "last_seen": time.monotonic()
+    }
+
+    return {"session_id": session_id, "total": len(mcqs)}
+
+
+def get_question(session, question_num):
+    """
+    Get one question of a session, without its answer.
+
+    Args:
+        session (dict): Session state
+        question_num (int): Question number (1-based)
+
+    Returns:
+        dict: Question number, text and options
+    """
+    mcq = _get_mcq(session, question_num)
+
+    return {
+        "question_num": question_num,
+        "total": len(session['mcqs']),
+        "question": mcq['question'],
+        "options": mcq['options']
+    }
+
+
+def submit_answer(session, body):
+    """
+    Record the answer to one question of a session.
+
+    Args:
+        session (dict): Session state
+        body (dict): Request body with question_num and either choice
+            (option number, 1-based) or answer (option text)
+
+    Returns:
+        dict: Confirmation with the number of answered questions
+    """
+    if 'graded' in session:
+        raise HTTPError(400, "The quiz has already been graded")
+
+    question_num = _get_int(body, "question_num", None)
+    mcq = _get_mcq(session, question_num)
+
+    if "choice" in body:
+        choice = _get_int(body, "choice", None)
+        if not 1 <= choice <= len(mcq['options']):
+            raise HTTPError(400, f"choice must be between 1 and {len(mcq['options'])}")
+        answer = mcq['options'][choice - 1]
+    elif "answer" in body:
+        answer = str(body["answer"])
+    else:
+        raise HTTPError(400, "Missing 'choice' or 'answer'")
+
+    session['answers'][question_num] = answer
+
+    return {"question_num": question_num, "answered": len(session['answers'])}
+
+
+def grade_session(session):
+    """
+    Grade a session with grader.grade_quiz and build its report.
+
+    Args:
+        session (dict): Session state
+
+    Returns:
+        dict: Report data from report.generate_report()
+    """
+    results = grader.grade_quiz(session['mcqs'], session['answers'])
+    return report.generate_report(results, session['mcqs'], session['answers'])
+
+
+async def grade_once(app, session_id, session):
+    """
+    Grade a session on its first grade request and return the same report
+    on every later one, so a session is graded and recorded only once.
+
+    Args:
+        app (dict): Application state
+        session_id (str): Session id (the student id of the submission)
+        session (dict): Session state
+
+    Returns:
+        dict: Report data from report.generate_report()
+    """
+    graded = session.get('graded')
+
+    if graded is None:
+        if app['grading'] is not None:
+            # Concurrent submissions are graded and written in micro-batches
+            graded = asyncio.ensure_future(app['grading'].submit(
+                session_id, dict(session['answers']), session['mcqs']))
+        else:
+            graded = asyncio.get_running_loop().create_future()
+            graded.set_result({"report": grade_session(session)})
+        session['graded'] = graded
+
+    try:
+        return (await asyncio.shield(graded))['report']
+    except Exception:
+        # Let a later request retry a failed grading
+        if session.get('graded') is graded:
+            del session['graded']
+        raise
+
+
+async def handle_request(app, method, path, body):
+    """
+    Route one request to its handler.
+
+    Args:
+        app (dict): Application state
+        method (str): HTTP method
+        path (str): Request path
+        body (dict): Parsed JSON body
+
+    Returns:
+        tuple: (status, response dict)
+    """
+    parts = [part for part in path.split('?', 1)[0].split('/') if part]
+
+    if parts == ["sessions"]:
+        if method != "POST":
+            raise HTTPError(405, "Use POST to create a session")
+        # Generation is CPU work; keep the event loop free for other students
+        loop = asyncio.get_running_loop()
+        mcqs = await loop.run_in_executor(None, generate_quiz, app, body)
+        return 201, create_session(app, mcqs)
+
+    if len(parts) < 2 or parts[0] != "sessions":
+        raise HTTPError(404, f"Unknown path: {path}")
+
+    session = app['sessions'].get(parts[1])
+    if session is None:
+        raise HTTPError(404, "Unknown or expired session")
+    session['last_seen'] = time.monotonic()
+
+    if len(parts) == 2 and method == "DELETE":
+        del app['sessions'][parts[1]]
+        return 200, {"deleted": parts[1]}
+
+    if len(parts) == 4 and parts[2] == "questions" and method == "GET":
+        try:
+            question_num = int(parts[3])
+        except ValueError:
+            raise HTTPError(400, "Question number must be an integer")
+        return 200, get_question(session, question_num)
+
+    if len(parts) == 3 and parts[2] == "answers" and method == "POST":
+        return 200, submit_answer(session, body)
+
+    if len(parts) == 3 and parts[2] == "grade" and method in ("GET", "POST"):
+        return 200, await grade_once(app, parts[1], session)
+
+    raise HTTPError(404, f"Unknown path: {method} {path}")
+
+
+async def handle_connection(app, reader, writer):
+    """
+    Serve HTTP/1.1 requests on one connection (keep-alive supported).
+
+    Args:
+        app (dict): Application state
+        reader (asyncio.StreamReader): Connection reader
+        writer (asyncio.StreamWriter): Connection writer
+    """
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+
+            try:
+                method, path, version = request_line.decode('latin-1').split()
+            except ValueError:
+                await _send(writer, 400, {"error": "Malformed request line"}, False)
+                break
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            keep_alive = (version == "HTTP/1.1"
+                          and headers.get("connection", "").lower() != "close")
+
+            try:
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    raise HTTPError(413, "Request body too large")
+
+                body = {}
+                if length:
+                    raw = await reader.readexactly(length)
+                    try:
+                        body = json.loads(raw.decode('utf-8'))
+                    except ValueError:
+                        raise HTTPError(400, "Body must be valid JSON")
+                    if not isinstance(body, dict):
+                        raise HTTPError(400, "Body must be a JSON object")
+
+                status, response = await handle_request(app, method.upper(), path, body)
+            except HTTPError as e:
+                status, response = e.status, {"error": e.message}
+                if e.status == 413:
+                    keep_alive = False
+            except Exception as e:
+                status, response = 500, {"error": f"Internal error: {e}"}
+
+            await _send(writer, status, response, keep_alive)
+
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def expire_sessions(app, ttl=SESSION_TTL, interval=60):
+    """
+    Periodically drop sessions that have been idle for longer than ttl.
+
+    Args:
+        app (dict): Application state
+        ttl (float): Idle time in seconds before a session expires
+        interval (float): Seconds between sweeps
+    """
+    while True:
+        await asyncio.sleep(interval)
+        cutoff = time.monotonic() - ttl
+        expired = [session_id for session_id, session in app['sessions'].items()
+                   if session['last_seen'] < cutoff]
+        for session_id in expired:
+            del app['sessions'][session_id]
+
+
+async def serve(notes, host="127.0.0.1", port=8000, bank=None, sections=None,
+                results_path=None):
+    """
+    Run the quiz server until cancelled.
+
+    Args:
+        notes (str): Cleaned lecture notes text
+        host (str): Interface to bind
+        port (int): Port to listen on
+        bank (bank_format.BankFile): Prebuilt question bank (optional)
+        sections (list): Section ranges from ingest.build_document() (optional)
+        results_path (str): JSONL file graded results are appended to (optional)
+    """
+    app = create_app(notes, bank, sections)
+    app['grading'] = grading_service.GradingService(results_path=results_path, formats=())
+    app['grading'].start()
+
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(app, reader, writer), host, port)
+    sweeper = asyncio.ensure_future(expire_sessions(app))
+
+    if bank is not None:
+        print(f"✓ Serving {len(bank)} banked questions on http://{host}:{port}")
+    else:
+        print(f"✓ Serving {len(app['sentences'])} sentences on http://{host}:{port}")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sweeper.cancel()
+        await app['grading'].close()
+
+
+async def _send(writer, status, response, keep_alive):
+    """
+    Write a JSON response.
+    """
+    payload = json.dumps(response).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + payload)
+    await writer.drain()
+
+
+def _get_mcq(session, question_num):
+    """
+    Look up a question of a session by its 1-based number.
+    """
+    if question_num is None or not 1 <= question_num <= len(session['mcqs']):
+        raise HTTPError(404, f"Question must be between 1 and {len(session['mcqs'])}")
+    return session['mcqs'][question_num - 1]
+
+
+def _get_int(body, key, default):
+    """
+    Read an integer field from a request body.
+    """
+    value = body.get(key, default)
+    if value is None:
+        if default is None:
+            raise HTTPError(400, f"Missing '{key}'")
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"'{key}' must be an integer")
+
+
+def _get_seed(body):
+    """
+    Read the optional seed from a request body (an integer or a string).
+    """
+    seed = body.get("seed")
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, (int, str))):
+        raise HTTPError(400, "'seed' must be an integer or a string")
+    return seed
+
+
+def main():
+    """
+    Command-line entry point for the quiz server.
+    """
+    parser = argparse.ArgumentParser(description="Serve quizzes over HTTP.")
+    parser.add_argument("--notes", default="data/lecture_notes.txt",
+                        help="Lecture notes file (default: data/lecture_notes.txt)")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--bank", default=None,
+                        help="Serve questions from a binary bank (.qbank) instead of the notes")
+    parser.add_argument("--results", default=None,
+                        help="Append every graded quiz to this JSONL file")
+    args = parser.parse_args()
+
+    bank = None
+    sections = None
+    if args.bank:
+        try:
+            bank = bank_format.open_bank(args.bank)
+        except (OSError, ValueError) as e:
+            print(f"Failed to open question bank: {e}")
+            return
+        notes = ""
+    else:
+        document = ingest.load_document(args.notes)
+        notes, sections = document['text'], document['sections']
+
+        if not notes:
+            print("Failed to load lecture notes. Exiting.")
+            return
+
+    try:
+        asyncio.run(serve(notes, args.host, args.port, bank, sections, args.results))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    finally:
+        if bank is not None:
+            bank.close()
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
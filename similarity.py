@@ -0,0 +1,146 @@
+"""
+Module: similarity.py
+Purpose: Find similar keywords with an inverted character n-gram index
+"""
+
+import heapq
+from collections import Counter
+
+import instrumentation
+
+
+NGRAM_SIZE = 3
+
+# Grams shared by more keywords than this are too common to be useful
+# and are skipped at query time, which keeps lookups sub-linear
+MAX_POSTINGS = 1000
+
+# Keywords less similar than this (Dice coefficient) are not neighbours
+MIN_SIMILARITY = 0.2
+
+
+def ngrams(word, n=NGRAM_SIZE):
+    """
+    Get the character n-grams of a word, padded with spaces.
+
+    Args:
+        word (str): Input word
+        n (int): Gram length
+
+    Returns:
+        set: Set of n-grams of the lowercase word
+    """
+    padded = f" {word.lower()} "
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+@instrumentation.timed()
+def build_ngram_index(keywords):
+    """
+    Build an inverted n-gram index over a list of keywords.
+
+    Args:
+        keywords (list): Keywords (duplicates, ignoring case, are skipped)
+
+    Returns:
+        dict: Index with keywords (list), sizes (gram count per keyword)
+            and postings (gram -> list of keyword ids)
+    """
+    ngram_index = {"keywords": [], "sizes": [], "postings": {}}
+    seen = set()
+
+    for keyword in keywords:
+        if keyword.lower() in seen:
+            continue
+        seen.add(keyword.lower())
+
+        keyword_id = len(ngram_index['keywords'])
+        grams = ngrams(keyword)
+        ngram_index['keywords'].append(keyword)
+        ngram_index['sizes'].append(len(grams))
+        for gram in grams:
+            ngram_index['postings'].setdefault(gram, []).append(keyword_id)
+
+    return ngram_index
+
+
+def nearest_keywords(ngram_index, keyword, k=3):
+    """
+    Find the k keywords most similar to a keyword.
+
+    Similarity is the Dice coefficient of the character n-gram sets. Only
+    keywords sharing at least one n-gram are scored, found through the
+    postings lists. The keyword itself, keywords that only differ from it
+    by a suffix (e.g. plurals) and keywords below MIN_SIMILARITY are never
+    returned.
+
+    Args:
+        ngram_index (dict): Index from build_ngram_index()
+        keyword (str): Keyword to find neighbours for
+        k (int): Number of neighbours
+
+    Returns:
+        list: Up to k keywords, most similar first
+    """
+    grams = ngrams(keyword)
+    lower = keyword.lower()
+    postings = ngram_index['postings']
+
+    shared = Counter()
+    for gram in grams:
+        ids = postings.get(gram)
+        if ids and len(ids) <= MAX_POSTINGS:
+            shared.update(ids)
+
+    keywords = ngram_index['keywords']
+    sizes = ngram_index['sizes']
+    scored = []
+    for keyword_id, count in shared.items():
+        score = 2.0 * count / (len(grams) + sizes[keyword_id])
+        if score < MIN_SIMILARITY:
+            continue
+        candidate = keywords[keyword_id].lower()
+        if not (candidate.startswith(lower) or lower.startswith(candidate)):
+            scored.append((-score, keyword_id))
+
+    return [keywords[keyword_id] for score, keyword_id in heapq.nsmallest(k, scored)]
+
+
+@instrumentation.timed()
+def nearest_keywords_batch(ngram_index, keywords, k=3):
+    """
+    Find neighbours for many keywords in one call.
+
+    Repeated keywords (ignoring case) are looked up only once.
+
+    Args:
+        ngram_index (dict): Index from build_ngram_index()
+        keywords (list): Keywords to find neighbours for
+        k (int): Number of neighbours per keyword
+
+    Returns:
+        list: One list of neighbours per input keyword
+    """
+    found = {}
+    results = []
+
+    for keyword in keywords:
+        lower = keyword.lower()
+        if lower not in found:
+            found[lower] = nearest_keywords(ngram_index, keyword, k)
+        results.append(found[lower])
+
+    return results
+
+
+# Test function (optional - for module testing)
+if __name__ == "__main__":
+    test_keywords = ["Python", "Pythonic", "Java", "JavaScript", "Inheritance",
+                     "Encapsulation", "Abstraction", "Polymorphism", "Iteration",
+                     "Recursion", "Lists", "List", "Tuples", "Sets"]
+    test_index = build_ngram_index(test_keywords)
+
+    for word, neighbours in zip(["Python", "Abstraction", "Lists"],
+                                nearest_keywords_batch(test_index,
+                                                       ["Python", "Abstraction", "Lists"])):
+        print(f"{word:<12} -> {neighbours}")
@@ -0,0 +1,219 @@
+"""
+Module: tokenizer.py
+Purpose: Single-pass sentence and word tokenizer working on text offsets
+"""
+
+import re
+
+
+# Common words that are never chosen as keywords
+STOPWORDS = frozenset([
+    'is', 'are', 'was', 'were', 'the', 'a', 'an', 'and', 'or',
+    'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'
+])
+
+# Abbreviations whose trailing period does not end a sentence
+ABBREVIATIONS = frozenset([
+    'e.g', 'i.e', 'vs', 'cf', 'al', 'mr', 'mrs', 'ms', 'dr', 'prof',
+    'sr', 'jr', 'st', 'fig', 'approx', 'dept', 'inc', 'ltd'
+])
+
+# Abbreviations that only hold before a number ("No. 5", not "has no. It")
+NUMBER_ABBREVIATIONS = frozenset(['no'])
+
+# Capitalized words that start a sentence rather than continue a name, so
+# "Plan A. Then plan B." ends after "A." although it looks like an initial
+SENTENCE_OPENERS = frozenset([
+    'A', 'After', 'Also', 'An', 'And', 'As', 'At', 'But', 'Each', 'Finally',
+    'For', 'He', 'Here', 'However', 'If', 'In', 'It', 'Its', 'Next', 'On',
+    'She', 'So', 'That', 'The', 'Then', 'There', 'These', 'They', 'This',
+    'Those', 'Thus', 'We', 'When', 'You'
+])
+
+SENTENCE_TERMINATORS = '.!?'
+# Closing quotes and brackets that may follow a terminator ('said "Hi." Then')
+SENTENCE_CLOSERS = '"\'\u201d\u2019)]'
+WORD_PUNCTUATION = '.,!?;:'
+
+
+def _compile_boundary(abbreviations, number_abbreviations):
+    """
+    Compile the sentence boundary pattern.
+
+    A boundary is a run of terminators, any closing quotes or brackets,
+    and the whitespace after them (or the end of the text). Abbreviations are excluded with fixed-width
+    lookbehinds (one per abbreviation length) that are only tried after a
+    period has matched, so the scan stays in the regex engine. Number
+    abbreviations are only excluded when a digit follows.
+    """
+    def lookbehind(words):
+        by_length = {}
+        for word in words:
+            by_length.setdefault(len(word), []).append(re.escape(word))
+        return ''.join(r'(?<!\b(?:%s)\.)' % '|'.join(sorted(group))
+                       for length, group in sorted(by_length.items()))
+
+    numbers = '|'.join(r'(?<=\b%s\.)' % re.escape(word)
+                       for word in sorted(number_abbreviations))
+
+    return re.compile(r'[.!?]%s(?!(?:%s)\s*\d)[.!?]*[%s]*(?:\s+|\Z)'
+                      % (lookbehind(abbreviations), numbers, re.escape(SENTENCE_CLOSERS)),
+                      re.IGNORECASE)
+
+
+def _is_initial(text, dot, after):
+    """
+    Check whether the period at text[dot] ends an initial ("John F. Kennedy").
+
+    Only an uppercase letter standing alone counts, and only when a
+    capitalized word follows and either a capitalized word or another
+    initial precedes it, or the next word is an initial too ("J. K.
+    Rowling"). A single letter after a lowercase word ("include C. Java")
+    or before a sentence opener ("Appendix B. The") ends the sentence.
+
+    Args:
+        text (str): Input text
+        dot (int): Offset of the period
+        after (int): Offset just past the boundary match
+
+    Returns:
+        bool: True if the period does not end a sentence
+    """
+    letter = dot - 1
+    if (letter < 0 or not text[letter].isupper()
+            or (letter > 0 and (text[letter - 1].isalnum() or text[letter - 1] == '_'))
+            or after >= len(text) or not text[after].isupper()):
+        return False
+
+    # The next word is itself an initial
+    if (text.startswith('.', after + 1)
+            and not (after + 2 < len(text) and not text[after + 2].isspace())):
+        return True
+
+    # The next word starts a new sentence
+    word_end = after
+    while word_end < len(text) and text[word_end].isalpha():
+        word_end += 1
+    if text[after:word_end] in SENTENCE_OPENERS:
+        return False
+
+    # The previous word is capitalized (a name or another initial)
+    end = letter
+    while end > 0 and text[end - 1].isspace():
+        end -= 1
+    if end == letter:
+        return False
+    begin = end
+    while begin > 0 and not text[begin - 1].isspace():
+        begin -= 1
+    return begin < end and text[begin].isupper()
+
+
+_BOUNDARY = _compile_boundary(ABBREVIATIONS, NUMBER_ABBREVIATIONS)
+_TOKEN = re.compile(r'\S+')
+
+
+def iter_sentences(text):
+    """
+    Find sentence spans in a single pass over the text.
+
+    A sentence ends at a run of '.', '!' or '?' followed by whitespace,
+    unless the period follows a known abbreviation ("e.g.", "No. 5") or
+    an initial (see _is_initial). Periods inside a token (decimals like 3.14,
+    file names) never end a sentence.
+
+    Args:
+        text (str): Input text
+
+    Yields:
+        tuple: (start, end) offsets, where text[start:end] is the sentence
+            without surrounding whitespace and trailing terminators
+    """
+    start = len(text) - len(text.lstrip())
+
+    for match in _BOUNDARY.finditer(text):
+        end = match.start()
+        if text[end] == '.' and _is_initial(text, end, match.end()):
+            continue
+
+        # Drop whitespace before a detached terminator ("word .")
+        while end > start and text[end - 1].isspace():
+            end -= 1
+
+        if start < end:
+            yield start, end
+        start = match.end()
+
+    # Text after the last terminator is still a sentence
+    end = len(text.rstrip())
+    if start < end:
+        yield start, end
+
+
+def tokenize(text, start=0, end=None):
+    """
+    Get the word spans of text, or of one sentence span within it.
+
+    Spans are produced lazily, so callers that stop early (keyword
+    selection) never look at the rest of the sentence.
+
+    Args:
+        text (str): Input text
+        start (int): Offset to start at (e.g. a sentence start)
+        end (int): Offset to stop at (default: end of text)
+
+    Yields:
+        tuple: (start, end) word spans without surrounding punctuation
+    """
+    if end is None:
+        end = len(text)
+
+    for match in _TOKEN.finditer(text, start, end):
+        raw = match.group()
+        word = raw.strip(WORD_PUNCTUATION)
+        if word:
+            word_start = match.start() + len(raw) - len(raw.lstrip(WORD_PUNCTUATION))
+            yield word_start, word_start + len(word)
+
+
+def sentence_keyword(text, start=0, end=None):
+    """
+    Pick the keyword of a sentence, or of one sentence span of a text.
+
+    The keyword is the first word longer than two characters that is not
+    a stopword, falling back to the first word. Words come from
+    tokenize(), so usually only the first few words are looked at and the
+    sentence never has to be copied out of the text.
+
+    Args:
+        text (str): Input sentence or text
+        start (int): Sentence start offset
+        end (int): Sentence end offset (default: end of text)
+
+    Returns:
+        str: Keyword, or "" if there are no words
+    """
+    first = ""
+
+    for word_start, word_end in tokenize(text, start, end):
+        word = text[word_start:word_end]
+        if len(word) > 2 and word.lower() not in STOPWORDS:
+            return word
+        if not first:
+            first = word
+
+    return first
+
+
+# Test function (optional - for module testing)
+if __name__ == "__main__":
+    test_text = ("Python 3.12 is fast. Is it easy? Yes! Guido van Rossum "
+                 "(i.e. the BDFL) created it, e.g. for teaching. Dr. Smith "
+                 "agrees. J. K. Rowling wrote No. 5 in C. Java has no. He said "
+                 "\"Hi.\" Then he left (see above.) See Appendix B. The end. "
+                 "Plan A. Then plan B. John F. Kennedy spoke")
+
+    for start, end in iter_sentences(test_text):
+        words = [test_text[s:e] for s, e in tokenize(test_text, start, end)]
+        print(f"[{start}:{end}] {test_text[start:end]!r}")
+        print(f"    keyword: {sentence_keyword(test_text, start, end)!r}, words: {words}")